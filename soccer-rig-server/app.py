@@ -5,10 +5,13 @@ This module provides the create_app() factory function required by gunicorn.
 """
 
 import os
+import hashlib
 import logging
 from contextlib import contextmanager
-from flask import Flask, request
+from functools import lru_cache
+from flask import Flask, request, url_for
 from flask_cors import CORS
+from jinja2 import FileSystemBytecodeCache
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -32,6 +35,7 @@ def create_app():
         gunicorn "app:create_app()"
     """
     from src.models import Base, get_engine, get_session
+    from src.cache import ResponseCache
     from src.auth import register_auth_routes
     from src.admin import register_admin_routes
     from src.services.heatmap import register_heatmap_routes
@@ -53,6 +57,12 @@ def create_app():
     app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', '/app/storage')
     app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max upload
 
+    # Persist compiled template bytecode so new workers skip Jinja codegen
+    # (defaults to a per-user directory under the system temp dir)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+        os.environ.get('JINJA_CACHE_DIR') or None
+    )
+
     # TeamSnap OAuth
     app.config['TEAMSNAP_CLIENT_ID'] = os.environ.get('TEAMSNAP_CLIENT_ID', '')
     app.config['TEAMSNAP_CLIENT_SECRET'] = os.environ.get('TEAMSNAP_CLIENT_SECRET', '')
@@ -63,6 +73,23 @@ def create_app():
         cors_origins = [o.strip() for o in cors_origins.split(',')]
     CORS(app, resources={r"/api/*": {"origins": cors_origins}})
 
+    # Content-versioned static URLs: ?v=<hash> changes whenever the file
+    # does, so browsers can cache versioned assets indefinitely
+    @lru_cache(maxsize=None)
+    def _static_hash(filename):
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+
+    @app.template_global()
+    def static_url(filename):
+        return url_for('static', filename=filename, v=_static_hash(filename))
+
+    @app.after_request
+    def cache_versioned_static(response):
+        if request.path.startswith('/static/') and 'v' in request.args:
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
     # Initialize database
     engine = get_engine(app.config['DATABASE_URL'])
     Base.metadata.create_all(engine)
@@ -71,6 +98,23 @@ def create_app():
     # Store db session factory in app config for routes
     app.config['db'] = db
 
+    # Redis response cache for rarely-changing API payloads (no-op without REDIS_URL)
+    app.config['cache'] = ResponseCache(os.environ.get('REDIS_URL'))
+
+    # Server-side sessions in Redis: the cookie carries only a session id
+    # instead of the signed user_id/email/name payload
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url:
+        try:
+            import redis
+            from flask_session import Session
+            app.config['SESSION_TYPE'] = 'redis'
+            app.config['SESSION_REDIS'] = redis.Redis.from_url(redis_url)
+            app.config['SESSION_KEY_PREFIX'] = 'soccer-rig:session:'
+            Session(app)
+        except ImportError:
+            logger.warning("flask-session not installed, using cookie sessions")
+
     # Register routes
     register_auth_routes(app, db)
     register_admin_routes(app)  # No db param needed
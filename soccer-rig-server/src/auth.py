@@ -7,16 +7,50 @@ Simple authentication for all user types:
 - Dashboard adapts based on user type
 """
 
+import hashlib
 import os
+import re
 import secrets
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Optional
-from flask import Flask, request, session, jsonify, redirect, url_for, render_template_string
+from flask import (
+    Flask, current_app, g, request, session, jsonify, redirect, url_for,
+    render_template
+)
+from jinja2 import ChoiceLoader, DictLoader
+from markupsafe import Markup, escape
+from sqlalchemy import and_, exists, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds a user's linked-players payload stays cached
+PLAYERS_CACHE_TTL = 300
+
+# Pre-encoded body for unauthenticated JSON requests (bots/probes hit this a lot)
+_AUTH_REQUIRED_401 = (
+    b'{"error":"Authentication required"}', 401, {'Content-Type': 'application/json'}
+)
+
+# Logins closer together than this don't update users.last_login
+LAST_LOGIN_RESOLUTION = timedelta(minutes=5)
+
+# Password verification is deliberately slow and memory-hard (argon2);
+# run it on a bounded pool so login bursts can't oversubscribe the CPU
+_password_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 2, thread_name_prefix='password'
+)
+
 
 # =============================================================================
 # Authentication Helpers
@@ -26,20 +60,39 @@ def login_required(f):
     """Decorator to require login."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
+        # Requests without a session cookie can't be logged in - reject them
+        # before the signed session cookie machinery is touched at all
+        has_cookie = current_app.config['SESSION_COOKIE_NAME'] in request.cookies
+        if not has_cookie or 'user_id' not in session:
             if request.is_json:
-                return jsonify({'error': 'Authentication required'}), 401
+                return _AUTH_REQUIRED_401
             return redirect(url_for('login'))
         return f(*args, **kwargs)
     return decorated_function
 
 
-def get_current_user(db):
-    """Get the current logged-in user."""
+def ojsonify(obj):
+    """jsonify() using orjson when available (falls back to Flask's encoder)."""
+    if orjson is None:
+        return jsonify(obj)
+    # Like jsonify, write int dict keys (e.g. player ids) as strings
+    return current_app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json'
+    )
+
+
+def get_current_user(db, *options):
+    """Get the current logged-in user.
+
+    The user is loaded once per request and cached on flask.g; loader
+    options (e.g. selectinload) only apply to that first load.
+    """
     if 'user_id' not in session:
         return None
-    from .models import User
-    return db.query(User).get(session['user_id'])
+    if not hasattr(g, '_current_user'):
+        from .models import User
+        g._current_user = db.query(User).options(*options).get(session['user_id'])
+    return g._current_user
 
 
 def get_user_team_ids(db, user_id: int) -> set:
@@ -55,7 +108,10 @@ def get_user_team_ids(db, user_id: int) -> set:
     """
     from .models import User, Team
     
-    user = db.query(User).get(user_id)
+    if user_id == session.get('user_id'):
+        user = get_current_user(db)
+    else:
+        user = db.query(User).get(user_id)
     if not user:
         return set()
     
@@ -87,6 +143,47 @@ def get_user_team_ids(db, user_id: int) -> set:
 
 def register_auth_routes(app: Flask, db):
     """Register authentication routes."""
+    from .cache import ResponseCache, user_players_key
+
+    cache = app.config.get('cache') or ResponseCache()
+
+    # Page templates are served by name: app.jinja_env caches each compiled
+    # template after first use, and the bytecode cache (see create_app)
+    # persists the compiled code across worker restarts
+    templates = {
+        'auth/login.html': LOGIN_HTML,
+        'auth/register.html': REGISTER_HTML,
+        'auth/dashboard.html': DASHBOARD_HTML,
+        'auth/settings.html': SETTINGS_HTML,
+        'auth/player_profile.html': PLAYER_PROFILE_HTML,
+    }
+    if not app.debug:
+        # Smaller responses and less template source for Jinja to lex
+        templates = {name: minify_html(src) for name, src in templates.items()}
+    app.jinja_loader = ChoiceLoader([DictLoader(templates), app.jinja_loader])
+
+    # Encoded body + ETag for pages that are identical for every visitor,
+    # keyed by template and context; these never touch Jinja after the
+    # first render
+    static_pages = {}
+
+    def render_static_page(template_name, **context):
+        """Render a visitor-independent page once; repeat visits get a 304.
+
+        Context values must come from a small fixed set (None, constant
+        error messages) - never user input - since every distinct context
+        is cached for the life of the worker.
+        """
+        key = (template_name, tuple(sorted(context.items())))
+        if key not in static_pages:
+            body = render_template(template_name, **context).encode('utf-8')
+            static_pages[key] = (body, hashlib.sha1(body).hexdigest())
+        body, etag = static_pages[key]
+
+        response = app.make_response(body)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+        return response.make_conditional(request)
 
     @app.route('/login', methods=['GET', 'POST'])
     def login():
@@ -99,20 +196,28 @@ def register_auth_routes(app: Flask, db):
 
             user = db.query(User).filter(User.email == email).first()
 
-            if user and user.check_password(password):
+            if user and _password_pool.submit(user.check_password, password).result():
                 session['user_id'] = user.id
                 session['user_email'] = user.email
                 session['user_name'] = user.full_name
                 session['user_role'] = user.role.value
-                user.last_login = datetime.utcnow()
-                db.commit()
+                if user.password_needs_rehash:
+                    # Upgrade legacy werkzeug hashes to argon2
+                    user.set_password(password)
+                # Only record last_login at LAST_LOGIN_RESOLUTION granularity
+                # so repeat logins don't each write the users row
+                now = datetime.utcnow()
+                if not user.last_login or now - user.last_login > LAST_LOGIN_RESOLUTION:
+                    user.last_login = now
+                if db.dirty:
+                    db.commit()
 
                 next_url = request.args.get('next', url_for('dashboard'))
                 return redirect(next_url)
             else:
-                return render_template_string(LOGIN_HTML, error='Invalid email or password')
+                return render_static_page('auth/login.html', error='Invalid email or password')
 
-        return render_template_string(LOGIN_HTML, error=None)
+        return render_static_page('auth/login.html', error=None)
 
     @app.route('/register', methods=['GET', 'POST'])
     def register():
@@ -138,12 +243,8 @@ def register_auth_routes(app: Flask, db):
             if not first_name or not last_name:
                 errors.append('First and last name required')
 
-            # Check if email exists
-            if db.query(User).filter(User.email == email).first():
-                errors.append('Email already registered')
-
             if errors:
-                return render_template_string(REGISTER_HTML, errors=errors)
+                return render_static_page('auth/register.html', errors=tuple(errors))
 
             # Map user type to role
             role_map = {
@@ -163,7 +264,12 @@ def register_auth_routes(app: Flask, db):
             )
             user.set_password(password)
             db.add(user)
-            db.commit()
+            try:
+                # Unique constraint on users.email rejects duplicates
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return render_static_page('auth/register.html', errors=('Email already registered',))
 
             # Auto-login
             session['user_id'] = user.id
@@ -173,7 +279,7 @@ def register_auth_routes(app: Flask, db):
 
             return redirect(url_for('dashboard'))
 
-        return render_template_string(REGISTER_HTML, errors=None)
+        return render_static_page('auth/register.html', errors=None)
 
     @app.route('/logout')
     def logout():
@@ -187,16 +293,20 @@ def register_auth_routes(app: Flask, db):
         """User dashboard - adapts to user type."""
         from .models import User, Player, GameEvent, Clip, Game
 
-        user = db.query(User).get(session['user_id'])
+        # selectinload (not joinedload) for collections avoids row explosion
+        user = get_current_user(
+            db, selectinload(User.children).selectinload(Player.teams)
+        )
+
+        role = user.role.value
 
         # Get linked players (children for parents, self for players)
-        linked_players = []
+        players = []
 
-        if user.role.value in ('parent', 'family'):
+        if role in ('parent', 'family'):
             # Parents and family see linked children
-            for child in user.children:
-                linked_players.append(_get_player_data(db, child))
-        elif user.role.value == 'player':
+            players = list(user.children)
+        elif role == 'player':
             # Players see themselves (if linked to a Player record)
             # Check if there's a player with matching email or linked
             player = db.query(Player).filter(
@@ -204,17 +314,20 @@ def register_auth_routes(app: Flask, db):
                 Player.last_name == user.last_name
             ).first()
             if player:
-                linked_players.append(_get_player_data(db, player))
-        elif user.role.value == 'coach':
+                players.append(player)
+        elif role == 'coach':
             # Coaches see all players on their teams
             for team in user.coached_teams:
                 for player in team.players:
-                    if not any(p['player'].id == player.id for p in linked_players):
-                        linked_players.append(_get_player_data(db, player))
+                    if player not in players:
+                        players.append(player)
+
+        linked_players = _get_players_data(db, players)
 
-        return render_template_string(
-            DASHBOARD_HTML,
+        return render_template(
+            'auth/dashboard.html',
             user=user,
+            role=role,
             players=linked_players
         )
 
@@ -224,7 +337,7 @@ def register_auth_routes(app: Flask, db):
         """User settings - notification preferences and TeamSnap integration."""
         from .models import User, NotificationFrequency
 
-        user = db.query(User).get(session['user_id'])
+        user = get_current_user(db)
 
         if request.method == 'POST':
             # Update notification preferences
@@ -252,27 +365,33 @@ def register_auth_routes(app: Flask, db):
             db.commit()
             return redirect(url_for('settings') + '?saved=1')
 
-        # Build callback URL for TeamSnap OAuth (proxy-safe)
-        callback_url = url_for('teamsnap_callback', _external=True)
-        
-        return render_template_string(SETTINGS_HTML, user=user, callback_url=callback_url)
+        # The page is a user-independent shell; settings.js fills it in
+        # from /api/user/settings. It revalidates like the other static
+        # pages, so a deploy never pairs an old shell with a new settings.js
+        return render_static_page('auth/settings.html')
 
     @app.route('/player/<int:player_id>')
     @login_required
     def player_profile(player_id: int):
         """Player profile page with stats and clips."""
-        from .models import User, Player, GameEvent, Clip, Game
+        from .models import Player, GameEvent, Clip, Game, parent_player
 
-        user = db.query(User).get(session['user_id'])
-        player = db.query(Player).get(player_id)
+        user = get_current_user(db)
+        player = db.query(Player).options(
+            selectinload(Player.teams)
+        ).get(player_id)
 
         if not player:
             return "Player not found", 404
 
         # Access control: parents/family see children, players see self, coaches see team
         has_access = False
-        if user.role.value in ('parent', 'family') and player in user.children:
-            has_access = True
+        if user.role.value in ('parent', 'family'):
+            # EXISTS on the association table instead of loading user.children
+            has_access = db.query(exists().where(and_(
+                parent_player.c.parent_id == user.id,
+                parent_player.c.player_id == player_id
+            ))).scalar()
         elif user.role.value == 'player':
             # Player can see their own profile
             if player.first_name == user.first_name and player.last_name == user.last_name:
@@ -288,31 +407,35 @@ def register_auth_routes(app: Flask, db):
         if not has_access:
             return "Access denied", 403
 
-        # Get all clips
-        clips = db.query(Clip, Game).join(
+        # Get all clips - only the columns the page renders, as plain rows
+        rows = db.query(*_clip_card_columns()).join(
             Game, Clip.game_id == Game.id
         ).join(
             GameEvent, Clip.event_id == GameEvent.id
         ).filter(
             GameEvent.player_id == player_id
         ).order_by(Clip.created_at.desc()).all()
+        clips = [_clip_card(row, '%b %d, %Y') for row in rows]
 
-        # Get season stats
+        # Get season stats - one query for all of the player's teams
         from .services.statistics import StatisticsService
         stats_service = StatisticsService(db)
-        stats = []
-        for team in player.teams:
-            team_stats = stats_service.get_player_season_stats(
-                player_id, team.id, team.season or f"Season {datetime.now().year}"
-            )
-            if team_stats:
-                stats.append({'team': team, 'stats': team_stats})
+        default_season = f"Season {datetime.now().year}"
+        team_stats = stats_service.get_player_stats_for_teams(
+            player_id, [(team.id, team.season or default_season) for team in player.teams]
+        )
+        stats = [
+            {'team': team, 'stats': team_stats[team.id]}
+            for team in player.teams if team.id in team_stats
+        ]
 
-        return render_template_string(
-            PLAYER_PROFILE_HTML,
+        return render_template(
+            'auth/player_profile.html',
             player=player,
             clips=clips,
-            stats=stats,
+            clips_count=len(clips),
+            teams_count=len(player.teams),
+            stats_html=_season_stats_html(stats),
             user=user
         )
 
@@ -324,11 +447,9 @@ def register_auth_routes(app: Flask, db):
     @login_required
     def api_current_user():
         """Get current user info."""
-        from .models import User
+        user = get_current_user(db)
 
-        user = db.query(User).get(session['user_id'])
-
-        return jsonify({
+        return ojsonify({
             'id': user.id,
             'email': user.email,
             'name': user.full_name,
@@ -337,13 +458,42 @@ def register_auth_routes(app: Flask, db):
             'teams_count': len(user.coached_teams)
         })
 
+    @app.route('/api/user/settings')
+    @login_required
+    def api_settings():
+        """Values for the settings page shell."""
+        user = get_current_user(db)
+
+        return ojsonify({
+            'role': user.role.value,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'phone': user.phone or '',
+            'notify_frequency': user.notify_frequency.value,
+            'notify_goals': user.notify_goals,
+            'notify_saves': user.notify_saves,
+            'notify_highlights': user.notify_highlights,
+            'teamsnap_connected': bool(user.teamsnap_token),
+            'teamsnap_client_id': user.teamsnap_client_id or '',
+            'teamsnap_has_secret': bool(user.teamsnap_client_secret),
+            'callback_url': url_for('teamsnap_callback', _external=True)
+        })
+
     @app.route('/api/user/players')
     @login_required
     def api_get_players():
         """Get all players linked to current user."""
         from .models import User, Player
 
-        user = db.query(User).get(session['user_id'])
+        cache_key = user_players_key(session['user_id'])
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return ojsonify(payload)
+
+        user = get_current_user(
+            db, selectinload(User.children).selectinload(Player.teams)
+        )
         players = []
 
         if user.role.value == 'parent':
@@ -354,7 +504,7 @@ def register_auth_routes(app: Flask, db):
                     if player not in players:
                         players.append(player)
 
-        return jsonify({
+        payload = {
             'players': [
                 {
                     'id': p.id,
@@ -367,7 +517,11 @@ def register_auth_routes(app: Flask, db):
                 }
                 for p in players
             ]
-        })
+        }
+        # Invalidated by TeamSnap sync and player link/create routes
+        cache.set(cache_key, payload, timeout=PLAYERS_CACHE_TTL)
+
+        return ojsonify(payload)
 
     @app.route('/api/user/notifications', methods=['GET', 'PUT'])
     @login_required
@@ -375,7 +529,7 @@ def register_auth_routes(app: Flask, db):
         """Get or update notification preferences."""
         from .models import User, NotificationFrequency
 
-        user = db.query(User).get(session['user_id'])
+        user = get_current_user(db)
 
         if request.method == 'PUT':
             data = request.get_json()
@@ -391,7 +545,7 @@ def register_auth_routes(app: Flask, db):
                 user.notify_game_ready = data['game_ready']
             db.commit()
 
-        return jsonify({
+        return ojsonify({
             'frequency': user.notify_frequency.value,
             'goals': user.notify_goals,
             'saves': user.notify_saves,
@@ -400,24 +554,122 @@ def register_auth_routes(app: Flask, db):
         })
 
 
-def _get_player_data(db, player):
-    """Get player data with recent clips and events."""
+def _clip_card_columns():
+    """Columns rendered on a clip card (loaded as rows, not ORM objects)."""
+    from .models import Clip, Game
+
+    return (
+        Clip.id, Clip.title, Clip.thumbnail_url, Clip.duration_seconds,
+        Game.game_date, Game.opponent
+    )
+
+
+def _clip_card(row, date_format: str) -> dict:
+    """Template context for a clip card row, with its meta line preformatted."""
+    card = dict(row._mapping)
+    date_str = row.game_date.strftime(date_format) if row.game_date else ''
+    card['meta'] = f"{row.opponent} - {date_str}"
+    return card
+
+
+_STAT_CARD = (
+    '<div class="stat-card"><div class="stat-value">{}</div>'
+    '<div class="stat-label">{}</div></div>'
+).format
+
+
+def _season_stats_html(stats) -> Markup:
+    """Season stats section of the player profile.
+
+    Built with plain string formatting rather than a nested Jinja block;
+    stat values are integers/floats, team names are escaped.
+    """
+    if not stats:
+        return Markup('')
+
+    parts = ['<div class="section"><h2>Season Stats</h2>']
+    for s in stats:
+        team_stats = s['stats']
+        cards = [
+            (team_stats['games_played'], 'Games'),
+            (team_stats['goals'], 'Goals'),
+            (team_stats['assists'], 'Assists'),
+            (team_stats['shots'], 'Shots'),
+        ]
+        if team_stats['saves']:
+            save_pct = team_stats['save_percentage']
+            cards.append((team_stats['saves'], 'Saves'))
+            cards.append((f"{round(save_pct, 1) if save_pct else 0}%", 'Save %'))
+
+        parts.append(
+            '<h3 style="color: #64748b; font-size: 0.875rem; margin-bottom: 0.5rem;">'
+            f'{escape(s["team"].name)}</h3><div class="stats-grid">'
+        )
+        parts.extend(_STAT_CARD(value, label) for value, label in cards)
+        parts.append('</div>')
+    parts.append('</div>')
+    return Markup(''.join(parts))
+
+
+def _get_players_data(db, players, clip_limit: int = 5):
+    """Get player data with recent clips for several players at once.
+
+    Recent clips for every player are fetched in a single query, ranked per
+    player with a window function, instead of one query per player. Clips
+    are joined to their game before ranking, so clips that cannot be shown
+    never take one of a player's clip_limit slots.
+    """
     from .models import GameEvent, Clip, Game
 
-    recent_clips = db.query(Clip, Game).join(
-        Game, Clip.game_id == Game.id
-    ).join(
-        GameEvent, Clip.event_id == GameEvent.id
-    ).filter(
-        GameEvent.player_id == player.id
-    ).order_by(Clip.created_at.desc()).limit(5).all()
-
-    return {
-        'player': player,
-        'teams': list(player.teams),
-        'recent_clips': [(c, g) for c, g in recent_clips],
-        'clip_count': len(recent_clips)
-    }
+    player_ids = [p.id for p in players]
+    recent_clips = defaultdict(list)
+
+    if player_ids:
+        ranked = db.query(
+            Clip.id.label('clip_id'),
+            GameEvent.player_id.label('player_id'),
+            func.row_number().over(
+                partition_by=GameEvent.player_id,
+                order_by=Clip.created_at.desc()
+            ).label('rank')
+        ).join(
+            GameEvent, Clip.event_id == GameEvent.id
+        ).join(
+            Game, Clip.game_id == Game.id
+        ).filter(
+            GameEvent.player_id.in_(player_ids)
+        ).subquery()
+
+        rows = db.query(*_clip_card_columns(), ranked.c.player_id).join(
+            ranked, Clip.id == ranked.c.clip_id
+        ).join(
+            Game, Clip.game_id == Game.id
+        ).filter(
+            ranked.c.rank <= clip_limit
+        ).order_by(Clip.created_at.desc()).all()
+
+        for row in rows:
+            recent_clips[row.player_id].append(_clip_card(row, '%b %d'))
+
+    return [
+        {
+            'player': player,
+            'teams': list(player.teams),
+            'teams_csv': ', '.join(t.name for t in player.teams),
+            'recent_clips': recent_clips[player.id],
+            'clip_count': len(recent_clips[player.id])
+        }
+        for player in players
+    ]
+
+
+def minify_html(html: str) -> str:
+    """Strip indentation and blank lines from a page template.
+
+    Newlines are kept (not collapsed to nothing) so whitespace between inline
+    elements and inside Jinja tags stays significant.
+    """
+    return re.sub(r'\n\s*', '\n', html).strip()
 
 
 # =============================================================================
@@ -431,22 +683,8 @@ LOGIN_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Login - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: linear-gradient(135deg, #1a472a 0%, #2d5a27 100%); color: #f1f5f9; min-height: 100vh; display: flex; align-items: center; justify-content: center; padding: 1rem; }
-        .login-box { background: rgba(255,255,255,0.95); padding: 2.5rem; border-radius: 1rem; width: 100%; max-width: 400px; box-shadow: 0 20px 60px rgba(0,0,0,0.3); color: #1a202c; }
-        .logo { text-align: center; font-size: 2rem; margin-bottom: 0.5rem; }
-        .tagline { text-align: center; color: #64748b; margin-bottom: 2rem; }
-        .form-group { margin-bottom: 1.25rem; }
-        label { display: block; margin-bottom: 0.5rem; font-weight: 500; color: #374151; }
-        input { width: 100%; padding: 0.875rem 1rem; border: 2px solid #e2e8f0; border-radius: 0.5rem; font-size: 1rem; }
-        input:focus { outline: none; border-color: #10b981; }
-        button { width: 100%; padding: 1rem; background: linear-gradient(135deg, #10b981, #059669); color: white; border: none; border-radius: 0.5rem; font-size: 1rem; font-weight: 600; cursor: pointer; }
-        button:hover { opacity: 0.9; }
-        .error { background: #fee2e2; color: #dc2626; padding: 0.75rem; border-radius: 0.5rem; margin-bottom: 1rem; text-align: center; }
-        .register-link { text-align: center; margin-top: 1.5rem; color: #64748b; }
-        .register-link a { color: #10b981; font-weight: 600; text-decoration: none; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/auth/common.css') }}">
+    <link rel="stylesheet" href="{{ static_url('css/auth/login.css') }}">
 </head>
 <body>
     <div class="login-box">
@@ -479,24 +717,8 @@ REGISTER_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Register - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: linear-gradient(135deg, #1a472a 0%, #2d5a27 100%); color: #f1f5f9; min-height: 100vh; display: flex; align-items: center; justify-content: center; padding: 1rem; }
-        .register-box { background: rgba(255,255,255,0.95); padding: 2.5rem; border-radius: 1rem; width: 100%; max-width: 450px; box-shadow: 0 20px 60px rgba(0,0,0,0.3); color: #1a202c; }
-        .logo { text-align: center; font-size: 2rem; margin-bottom: 0.5rem; }
-        .tagline { text-align: center; color: #64748b; margin-bottom: 2rem; }
-        .form-group { margin-bottom: 1.25rem; }
-        .form-row { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
-        label { display: block; margin-bottom: 0.5rem; font-weight: 500; color: #374151; }
-        input, select { width: 100%; padding: 0.875rem 1rem; border: 2px solid #e2e8f0; border-radius: 0.5rem; font-size: 1rem; background: white; }
-        input:focus, select:focus { outline: none; border-color: #10b981; }
-        button { width: 100%; padding: 1rem; background: linear-gradient(135deg, #10b981, #059669); color: white; border: none; border-radius: 0.5rem; font-size: 1rem; font-weight: 600; cursor: pointer; }
-        .error-list { background: #fee2e2; color: #dc2626; padding: 0.75rem; border-radius: 0.5rem; margin-bottom: 1rem; }
-        .error-list li { margin-left: 1rem; }
-        .login-link { text-align: center; margin-top: 1.5rem; color: #64748b; }
-        .login-link a { color: #10b981; font-weight: 600; text-decoration: none; }
-        .user-type-info { font-size: 0.75rem; color: #64748b; margin-top: 0.25rem; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/auth/common.css') }}">
+    <link rel="stylesheet" href="{{ static_url('css/auth/register.css') }}">
 </head>
 <body>
     <div class="register-box">
@@ -553,40 +775,13 @@ DASHBOARD_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Dashboard - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f0f4f8; color: #1a202c; min-height: 100vh; }
-        .header { background: linear-gradient(135deg, #1a472a 0%, #2d5a27 100%); color: white; padding: 1.5rem 2rem; }
-        .header-content { max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-        .header h1 { font-size: 1.5rem; }
-        .header-nav a { color: white; margin-left: 1.5rem; text-decoration: none; opacity: 0.9; }
-        .header-nav a:hover { opacity: 1; }
-        .user-badge { background: rgba(255,255,255,0.2); padding: 0.25rem 0.75rem; border-radius: 1rem; font-size: 0.75rem; margin-left: 0.75rem; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 2rem; }
-        .welcome { margin-bottom: 2rem; }
-        .welcome h2 { font-size: 1.75rem; margin-bottom: 0.5rem; }
-        .welcome p { color: #64748b; }
-        .no-players { background: white; padding: 3rem; border-radius: 1rem; text-align: center; }
-        .no-players h3 { margin-bottom: 1rem; }
-        .no-players p { color: #64748b; margin-bottom: 1.5rem; }
-        .no-players a { background: #10b981; color: white; padding: 0.75rem 1.5rem; border-radius: 0.5rem; text-decoration: none; }
-        .player-card { background: white; border-radius: 1rem; padding: 1.5rem; margin-bottom: 1.5rem; box-shadow: 0 2px 8px rgba(0,0,0,0.05); }
-        .player-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem; border-bottom: 1px solid #e2e8f0; padding-bottom: 1rem; }
-        .player-name { font-size: 1.25rem; font-weight: 700; }
-        .player-teams { color: #64748b; font-size: 0.875rem; }
-        .clips-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 1rem; }
-        .clip-card { background: #f8fafc; border-radius: 0.5rem; overflow: hidden; }
-        .clip-thumb { width: 100%; aspect-ratio: 16/9; background: #e2e8f0; display: flex; align-items: center; justify-content: center; font-size: 2rem; }
-        .clip-info { padding: 0.75rem; }
-        .clip-title { font-weight: 600; font-size: 0.875rem; }
-        .clip-meta { color: #64748b; font-size: 0.75rem; }
-        .view-all { display: inline-block; margin-top: 1rem; color: #10b981; text-decoration: none; font-weight: 600; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/auth/common.css') }}">
+    <link rel="stylesheet" href="{{ static_url('css/auth/dashboard.css') }}">
 </head>
 <body>
     <div class="header">
         <div class="header-content">
-            <h1>Soccer Rig <span class="user-badge">{{ user.role.value }}</span></h1>
+            <h1>Soccer Rig <span class="user-badge">{{ role }}</span></h1>
             <nav class="header-nav">
                 <a href="/settings">Settings</a>
                 <a href="/logout">Logout</a>
@@ -596,13 +791,13 @@ DASHBOARD_HTML = """
     <div class="container">
         <div class="welcome">
             <h2>Welcome, {{ user.first_name }}!</h2>
-            <p>{% if user.role.value == 'parent' %}View your children's soccer clips and highlights.{% elif user.role.value == 'player' %}View your clips and stats.{% elif user.role.value == 'coach' %}View your team's clips and player stats.{% endif %}</p>
+            <p>{% if role == 'parent' %}View your children's soccer clips and highlights.{% elif role == 'player' %}View your clips and stats.{% elif role == 'coach' %}View your team's clips and player stats.{% endif %}</p>
         </div>
 
         {% if not players %}
         <div class="no-players">
             <h3>No Players Linked</h3>
-            <p>{% if user.role.value == 'parent' %}Connect your TeamSnap account to automatically link your children.{% elif user.role.value == 'coach' %}Your team will appear here once configured.{% else %}Your player profile will appear here once linked.{% endif %}</p>
+            <p>{% if role == 'parent' %}Connect your TeamSnap account to automatically link your children.{% elif role == 'coach' %}Your team will appear here once configured.{% else %}Your player profile will appear here once linked.{% endif %}</p>
             <a href="/auth/teamsnap">Connect TeamSnap</a>
         </div>
         {% else %}
@@ -611,23 +806,19 @@ DASHBOARD_HTML = """
                 <div class="player-header">
                     <div>
                         <div class="player-name">{{ player_data.player.full_name }}</div>
-                        <div class="player-teams">
-                            {% for team in player_data.teams %}
-                                {{ team.name }}{% if not loop.last %}, {% endif %}
-                            {% endfor %}
-                        </div>
+                        <div class="player-teams">{{ player_data.teams_csv }}</div>
                     </div>
                     <a href="/player/{{ player_data.player.id }}" class="view-all">View All</a>
                 </div>
 
                 {% if player_data.recent_clips %}
                 <div class="clips-grid">
-                    {% for clip, game in player_data.recent_clips %}
+                    {% for clip in player_data.recent_clips %}
                     <div class="clip-card">
                         <div class="clip-thumb">clip</div>
                         <div class="clip-info">
                             <div class="clip-title">{{ clip.title }}</div>
-                            <div class="clip-meta">{{ game.opponent }} - {{ game.game_date.strftime('%b %d') if game.game_date else '' }}</div>
+                            <div class="clip-meta">{{ clip.meta }}</div>
                         </div>
                     </div>
                     {% endfor %}
@@ -650,24 +841,8 @@ SETTINGS_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Settings - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f0f4f8; color: #1a202c; min-height: 100vh; }
-        .header { background: linear-gradient(135deg, #1a472a 0%, #2d5a27 100%); color: white; padding: 1.5rem 2rem; }
-        .header-content { max-width: 800px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-        .container { max-width: 800px; margin: 0 auto; padding: 2rem; }
-        .card { background: white; border-radius: 1rem; padding: 2rem; margin-bottom: 1.5rem; }
-        .card h2 { font-size: 1.25rem; margin-bottom: 1.5rem; padding-bottom: 0.75rem; border-bottom: 1px solid #e2e8f0; }
-        .form-group { margin-bottom: 1.25rem; }
-        .form-row { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
-        label { display: block; margin-bottom: 0.5rem; font-weight: 500; }
-        input, select { width: 100%; padding: 0.75rem; border: 2px solid #e2e8f0; border-radius: 0.5rem; font-size: 1rem; }
-        .checkbox { display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.75rem; }
-        .checkbox input { width: auto; }
-        button { padding: 0.875rem 2rem; background: #10b981; color: white; border: none; border-radius: 0.5rem; font-size: 1rem; font-weight: 600; cursor: pointer; }
-        .saved { background: #d1fae5; color: #059669; padding: 0.75rem; border-radius: 0.5rem; margin-bottom: 1rem; }
-        .role-badge { display: inline-block; background: #e2e8f0; padding: 0.25rem 0.75rem; border-radius: 1rem; font-size: 0.75rem; color: #64748b; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/auth/common.css') }}">
+    <link rel="stylesheet" href="{{ static_url('css/auth/settings.css') }}">
 </head>
 <body>
     <div class="header">
@@ -677,30 +852,28 @@ SETTINGS_HTML = """
         </div>
     </div>
     <div class="container">
-        {% if request.args.get('saved') %}
-        <div class="saved">Settings saved successfully!</div>
-        {% endif %}
+        <div class="saved" id="saved-banner" hidden>Settings saved successfully!</div>
 
-        <form method="POST">
+        <form method="POST" id="settings-form">
             <div class="card">
-                <h2>Profile <span class="role-badge">{{ user.role.value }}</span></h2>
+                <h2>Profile <span class="role-badge" data-text="role"></span></h2>
                 <div class="form-row">
                     <div class="form-group">
                         <label>First Name</label>
-                        <input type="text" name="first_name" value="{{ user.first_name }}">
+                        <input type="text" name="first_name" data-field="first_name">
                     </div>
                     <div class="form-group">
                         <label>Last Name</label>
-                        <input type="text" name="last_name" value="{{ user.last_name }}">
+                        <input type="text" name="last_name" data-field="last_name">
                     </div>
                 </div>
                 <div class="form-group">
                     <label>Email</label>
-                    <input type="email" value="{{ user.email }}" disabled>
+                    <input type="email" data-field="email" disabled>
                 </div>
                 <div class="form-group">
                     <label>Phone</label>
-                    <input type="tel" name="phone" value="{{ user.phone or '' }}">
+                    <input type="tel" name="phone" data-field="phone">
                 </div>
             </div>
 
@@ -708,25 +881,25 @@ SETTINGS_HTML = """
                 <h2>Notification Preferences</h2>
                 <div class="form-group">
                     <label>Email Frequency</label>
-                    <select name="notify_frequency">
-                        <option value="instant" {% if user.notify_frequency.value == 'instant' %}selected{% endif %}>Instant</option>
-                        <option value="daily" {% if user.notify_frequency.value == 'daily' %}selected{% endif %}>Daily Digest</option>
-                        <option value="weekly" {% if user.notify_frequency.value == 'weekly' %}selected{% endif %}>Weekly Digest</option>
-                        <option value="none" {% if user.notify_frequency.value == 'none' %}selected{% endif %}>None</option>
+                    <select name="notify_frequency" data-field="notify_frequency">
+                        <option value="instant">Instant</option>
+                        <option value="daily">Daily Digest</option>
+                        <option value="weekly">Weekly Digest</option>
+                        <option value="none">None</option>
                     </select>
                 </div>
                 <div class="form-group">
                     <label>Notify me when:</label>
                     <div class="checkbox">
-                        <input type="checkbox" name="notify_goals" {% if user.notify_goals %}checked{% endif %}>
+                        <input type="checkbox" name="notify_goals" data-field="notify_goals">
                         <span>A goal is scored</span>
                     </div>
                     <div class="checkbox">
-                        <input type="checkbox" name="notify_saves" {% if user.notify_saves %}checked{% endif %}>
+                        <input type="checkbox" name="notify_saves" data-field="notify_saves">
                         <span>A save is made (goalkeepers)</span>
                     </div>
                     <div class="checkbox">
-                        <input type="checkbox" name="notify_highlights" {% if user.notify_highlights %}checked{% endif %}>
+                        <input type="checkbox" name="notify_highlights" data-field="notify_highlights">
                         <span>Highlight reels are ready</span>
                     </div>
             </div>
@@ -734,44 +907,40 @@ SETTINGS_HTML = """
             <div class="card">
                 <h2>TeamSnap Integration</h2>
                 <p style="color: #64748b; margin-bottom: 1rem;">Connect your TeamSnap account to automatically sync rosters and schedules.</p>
-                
-                {% if user.teamsnap_token %}
-                <div style="background: #d1fae5; padding: 0.75rem; border-radius: 0.5rem; margin-bottom: 1rem; display: flex; justify-content: space-between; align-items: center;">
+
+                <div id="teamsnap-connected" hidden style="background: #d1fae5; padding: 0.75rem; border-radius: 0.5rem; margin-bottom: 1rem; display: flex; justify-content: space-between; align-items: center;">
                     <span style="color: #059669;">✓ Connected to TeamSnap</span>
                     <a href="/auth/teamsnap/disconnect" style="color: #dc2626; font-size: 0.875rem;">Disconnect</a>
                 </div>
-                {% else %}
-                <div style="background: #fef3c7; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;">
+                <div id="teamsnap-setup" hidden style="background: #fef3c7; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;">
                     <strong style="color: #92400e;">Setup Required:</strong>
                     <ol style="color: #92400e; margin-left: 1.5rem; margin-top: 0.5rem; font-size: 0.875rem;">
                         <li>Go to <a href="https://auth.teamsnap.com/oauth/applications" target="_blank" style="color: #1a472a;">TeamSnap OAuth Applications</a></li>
                         <li>Click "New Application"</li>
                         <li>Enter any name (e.g., "Soccer Rig")</li>
-                        <li>Set Redirect URI to: <code style="background: #fef9c3; padding: 0.25rem;">{{ callback_url }}</code></li>
+                        <li>Set Redirect URI to: <code style="background: #fef9c3; padding: 0.25rem;" data-text="callback_url"></code></li>
                         <li>Copy your Client ID and Secret below</li>
                     </ol>
                 </div>
-                {% endif %}
-                
+
                 <div class="form-group">
                     <label>TeamSnap Client ID</label>
-                    <input type="text" name="teamsnap_client_id" value="{{ user.teamsnap_client_id or '' }}" placeholder="Your OAuth Client ID">
+                    <input type="text" name="teamsnap_client_id" data-field="teamsnap_client_id" placeholder="Your OAuth Client ID">
                 </div>
                 <div class="form-group">
                     <label>TeamSnap Client Secret</label>
-                    <input type="password" name="teamsnap_client_secret" value="{{ user.teamsnap_client_secret or '' }}" placeholder="Your OAuth Client Secret">
+                    <input type="password" name="teamsnap_client_secret" id="teamsnap-client-secret" placeholder="Your OAuth Client Secret">
                 </div>
-                
-                {% if user.teamsnap_client_id and user.teamsnap_client_secret and not user.teamsnap_token %}
-                <a href="/auth/teamsnap" class="btn" style="display: inline-block; background: #10b981; color: white; padding: 0.75rem 1.5rem; border-radius: 0.5rem; text-decoration: none; text-align: center;">
+
+                <a href="/auth/teamsnap" id="teamsnap-connect" hidden class="btn" style="display: inline-block; background: #10b981; color: white; padding: 0.75rem 1.5rem; border-radius: 0.5rem; text-decoration: none; text-align: center;">
                     Connect TeamSnap
                 </a>
-                {% endif %}
             </div>
 
-            <button type="submit">Save Settings</button>
+            <button type="submit" disabled>Save Settings</button>
         </form>
     </div>
+    <script src="{{ static_url('js/settings.js') }}"></script>
 </body>
 </html>
 """
@@ -783,84 +952,30 @@ PLAYER_PROFILE_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{ player.full_name }} - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f0f4f8; color: #1a202c; min-height: 100vh; }
-        .header { background: linear-gradient(135deg, #1a472a 0%, #2d5a27 100%); color: white; padding: 2rem; }
-        .header-content { max-width: 1200px; margin: 0 auto; }
-        .player-name { font-size: 2rem; font-weight: 700; }
-        .player-meta { opacity: 0.9; margin-top: 0.5rem; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 2rem; }
-        .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 1rem; margin-bottom: 2rem; }
-        .stat-card { background: white; padding: 1.25rem; border-radius: 0.75rem; text-align: center; }
-        .stat-value { font-size: 2rem; font-weight: 700; color: #10b981; }
-        .stat-label { color: #64748b; font-size: 0.75rem; text-transform: uppercase; }
-        .section { margin-bottom: 2rem; }
-        .section h2 { font-size: 1.25rem; margin-bottom: 1rem; }
-        .clips-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(250px, 1fr)); gap: 1rem; }
-        .clip-card { background: white; border-radius: 0.75rem; overflow: hidden; }
-        .clip-thumb { width: 100%; aspect-ratio: 16/9; background: #1a202c; display: flex; align-items: center; justify-content: center; color: white; font-size: 3rem; }
-        .clip-info { padding: 1rem; }
-        .clip-title { font-weight: 600; margin-bottom: 0.25rem; }
-        .clip-meta { color: #64748b; font-size: 0.875rem; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/auth/common.css') }}">
+    <link rel="stylesheet" href="{{ static_url('css/auth/player_profile.css') }}">
 </head>
 <body>
     <div class="header">
         <div class="header-content">
             <a href="/dashboard" style="color: white; opacity: 0.8; text-decoration: none; display: inline-block; margin-bottom: 1rem;">Back to Dashboard</a>
             <div class="player-name">{{ player.full_name }}</div>
-            <div class="player-meta">Born {{ player.birth_year }} - {{ player.teams|length }} team(s)</div>
+            <div class="player-meta">Born {{ player.birth_year }} - {{ teams_count }} team(s)</div>
         </div>
     </div>
     <div class="container">
-        {% if stats %}
-        <div class="section">
-            <h2>Season Stats</h2>
-            {% for s in stats %}
-            <h3 style="color: #64748b; font-size: 0.875rem; margin-bottom: 0.5rem;">{{ s.team.name }}</h3>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.games_played }}</div>
-                    <div class="stat-label">Games</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.goals }}</div>
-                    <div class="stat-label">Goals</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.assists }}</div>
-                    <div class="stat-label">Assists</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.shots }}</div>
-                    <div class="stat-label">Shots</div>
-                </div>
-                {% if s.stats.saves %}
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.saves }}</div>
-                    <div class="stat-label">Saves</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{{ s.stats.save_percentage|round(1) if s.stats.save_percentage else 0 }}%</div>
-                    <div class="stat-label">Save %</div>
-                </div>
-                {% endif %}
-            </div>
-            {% endfor %}
-        </div>
-        {% endif %}
+        {{ stats_html }}
 
         <div class="section">
-            <h2>All Clips ({{ clips|length }})</h2>
+            <h2>All Clips ({{ clips_count }})</h2>
             {% if clips %}
             <div class="clips-grid">
-                {% for clip, game in clips %}
+                {% for clip in clips %}
                 <div class="clip-card">
                     <div class="clip-thumb">clip</div>
                     <div class="clip-info">
                         <div class="clip-title">{{ clip.title }}</div>
-                        <div class="clip-meta">{{ game.opponent }} - {{ game.game_date.strftime('%b %d, %Y') if game.game_date else '' }}</div>
+                        <div class="clip-meta">{{ clip.meta }}</div>
                     </div>
                 </div>
                 {% endfor %}
@@ -0,0 +1,112 @@
+"""
+Response Cache
+
+Small Redis-backed cache for JSON API payloads that rarely change:
+- Entries are plain dicts serialized as JSON (never ORM objects)
+- Every entry has a TTL; writers delete keys explicitly on mutation
+- Disabled (no-op) when REDIS_URL is not set or Redis is unreachable
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Key/value cache for API responses.
+
+    Usage:
+        cache = ResponseCache(os.environ.get('REDIS_URL'))
+
+        payload = cache.get(f'user_players:{user_id}')
+        if payload is None:
+            payload = build_payload()
+            cache.set(f'user_players:{user_id}', payload, timeout=300)
+
+        # After a write that changes the payload
+        cache.delete(f'user_players:{user_id}')
+    """
+
+    KEY_PREFIX = 'soccer-rig:'
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self._redis = None
+
+        if not redis_url:
+            return
+
+        try:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+        except ImportError:
+            logger.warning("redis not installed, response cache disabled")
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on miss or cache failure."""
+        if not self._redis:
+            return None
+        try:
+            raw = self._redis.get(self.KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, timeout: int = 300) -> None:
+        """Store a JSON-serializable value with a TTL in seconds."""
+        if not self._redis:
+            return
+        try:
+            self._redis.set(self.KEY_PREFIX + key, json.dumps(value), ex=timeout)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+
+    def delete(self, *keys: str) -> None:
+        """Invalidate one or more keys."""
+        if not self._redis or not keys:
+            return
+        try:
+            self._redis.delete(*(self.KEY_PREFIX + k for k in keys))
+        except Exception as e:
+            logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+def user_players_key(user_id: int) -> str:
+    """
+    Cache key for a user's linked players (/api/user/players).
+
+    Invalidation contract: a write that changes which players a user sees
+    (parent_player links, team_player rosters of coached teams) or a seen
+    player's name, birth year or teams must delete this key for every
+    affected user in the same request. The TeamSnap routes do so:
+    link-player drops the linking user, create-player also drops the
+    team's coaches, and the OAuth and manual syncs drop the syncing user
+    plus the coaches and parents of every synced team. Anything else that
+    touches these tables, such as demo data generation or manual database
+    edits, is only picked up once the 300s TTL expires.
+    """
+    return f'user_players:{user_id}'
+
+
+def heatmap_player_key(player_id: int, game_id: Optional[int],
+                       time_start: Optional[float], time_end: Optional[float],
+                       events_version: str) -> str:
+    """
+    Cache key for a player heat map (/api/heatmap/player/<id>).
+
+    events_version changes whenever the player's events are added or
+    removed, so stale entries are never read and simply expire.
+    """
+    return f'heatmap_player:{player_id}:{game_id}:{time_start}:{time_end}:{events_version}'
+
+
+def social_job_key(job_id: str) -> str:
+    """Cache key for a background social export job (/api/social/job/<id>)."""
+    return f'social_job:{job_id}'
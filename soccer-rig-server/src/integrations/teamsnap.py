@@ -781,6 +781,9 @@ def register_teamsnap_routes(app, db):
     Users set up their client_id and client_secret in Settings.
     """
     from flask import redirect, request, session, jsonify
+    from ..cache import ResponseCache, user_players_key
+
+    cache = app.config.get('cache') or ResponseCache()
 
     def get_user_client(user):
         """Get TeamSnapClient configured with user's credentials."""
@@ -793,6 +796,26 @@ def register_teamsnap_routes(app, db):
             redirect_uri=redirect_uri
         )
 
+    def invalidate_synced_players(user_id, sync_result):
+        """
+        Drop the cached player lists a sync may have changed: the syncing
+        user's, plus those of the coaches of every synced team and the
+        parents of its players (rosters and players' teams change).
+        """
+        from ..models import parent_player, team_coach, team_player
+
+        stale_user_ids = {user_id}
+        team_ids = [t['team_id'] for t in sync_result.get('teams', []) if t.get('team_id')]
+        if team_ids:
+            coaches = db.query(team_coach.c.user_id).filter(
+                team_coach.c.team_id.in_(team_ids)
+            )
+            parents = db.query(parent_player.c.parent_id).join(
+                team_player, team_player.c.player_id == parent_player.c.player_id
+            ).filter(team_player.c.team_id.in_(team_ids))
+            stale_user_ids.update(uid for (uid,) in coaches.union(parents))
+        cache.delete(*(user_players_key(uid) for uid in stale_user_ids))
+
     @app.route('/auth/teamsnap')
     def teamsnap_auth():
         """Start TeamSnap OAuth flow using user's own credentials."""
@@ -858,6 +881,7 @@ def register_teamsnap_routes(app, db):
             # Auto-sync all teams
             sync_service = TeamSnapSyncService(db, client)
             sync_result = sync_service.sync_user_teams(user_id)
+            invalidate_synced_players(user_id, sync_result)
 
             logger.info(f"TeamSnap sync for user {user_id}: {sync_result}")
 
@@ -899,6 +923,7 @@ def register_teamsnap_routes(app, db):
         
         sync_service = TeamSnapSyncService(db, client)
         result = sync_service.sync_user_teams(user_id)
+        invalidate_synced_players(user_id, result)
 
         return jsonify(result)
 
@@ -1350,6 +1375,7 @@ def register_teamsnap_routes(app, db):
             )
         )
         db.commit()
+        cache.delete(user_players_key(user_id))
 
         return jsonify({
             'success': True,
@@ -1391,10 +1417,14 @@ def register_teamsnap_routes(app, db):
         db.add(player)
         db.flush()
 
+        # Users whose cached player lists include this player
+        stale_user_ids = {user_id}
+
         # Link to team if provided
         if data.get('team_id'):
             team = db.query(Team).get(data['team_id'])
             if team:
+                stale_user_ids.update(c.id for c in team.coaches)
                 db.execute(
                     team_player.insert().values(
                         team_id=team.id,
@@ -1415,6 +1445,7 @@ def register_teamsnap_routes(app, db):
             )
 
         db.commit()
+        cache.delete(*(user_players_key(uid) for uid in stale_user_ids))
 
         return jsonify({
             'success': True,
@@ -12,6 +12,7 @@ Schema Design:
 Birth year is used instead of age groups (U13, U14) for flexibility.
 """
 
+import os
 from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
@@ -20,9 +21,16 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import declarative_base, relationship, backref
 from sqlalchemy.types import JSON, TypeDecorator
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import enum
 
+# Argon2id via argon2-cffi (native code, releases the GIL while hashing).
+# Hashes created by werkzeug before the switch are still accepted and are
+# upgraded on the next successful login.
+_password_hasher = PasswordHasher()
+
 
 class JSONB(TypeDecorator):
     """
@@ -193,10 +201,23 @@ class User(Base):
     followed_teams = relationship('Team', secondary=user_team, back_populates='followers')
 
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        if not self.password_hash.startswith('$argon2'):
+            # Legacy werkzeug PBKDF2/scrypt hash
+            return check_password_hash(self.password_hash, password)
+        try:
+            return _password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    @property
+    def password_needs_rehash(self) -> bool:
+        """True for legacy hashes or argon2 hashes with outdated parameters."""
+        if not self.password_hash.startswith('$argon2'):
+            return True
+        return _password_hasher.check_needs_rehash(self.password_hash)
 
     @property
     def full_name(self) -> str:
@@ -450,6 +471,11 @@ class GameEvent(Base):
     player = relationship('Player', back_populates='events')
     clips = relationship('Clip', back_populates='event')
 
+    __table_args__ = (
+        # Player clip/event lookups filter by player, optionally per game
+        Index('idx_game_events_player_game', 'player_id', 'game_id'),
+    )
+
     @property
     def display_time(self) -> str:
         """Format timestamp as MM:SS."""
@@ -495,6 +521,15 @@ class Clip(Base):
     game = relationship('Game', back_populates='clips')
     event = relationship('GameEvent', back_populates='clips')
 
+    __table_args__ = (
+        # Newest-first clip listings; on PostgreSQL the card columns are
+        # INCLUDEd so the listing can be served by an index-only scan
+        Index(
+            'idx_clips_created', created_at.desc(),
+            postgresql_include=['title', 'thumbnail_url', 'duration_seconds']
+        ),
+    )
+
 
 # =============================================================================
 # Statistics Models
@@ -638,8 +673,30 @@ def init_db(database_url: str):
 
 
 def get_engine(database_url: str):
-    """Create SQLAlchemy engine from database URL."""
-    return create_engine(database_url, pool_pre_ping=True)
+    """
+    Create SQLAlchemy engine from database URL.
+
+    Connection pool sizing can be tuned with environment variables:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW (-1 for unlimited), DB_POOL_RECYCLE
+    and DB_POOL_TIMEOUT (seconds).
+    """
+    engine_args = {
+        'pool_pre_ping': True,
+        # Compiled SQL cache (default 500) - routes repeat the same ORM
+        # statements, so a larger LRU avoids recompiling them under load
+        'query_cache_size': 1200,
+    }
+
+    # SQLite uses its own pool implementations that don't accept sizing args
+    if not database_url.startswith('sqlite'):
+        engine_args.update(
+            pool_size=int(os.environ.get('DB_POOL_SIZE', 20)),
+            max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        )
+
+    return create_engine(database_url, **engine_args)
 
 
 def get_session(engine):
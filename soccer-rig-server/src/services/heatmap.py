@@ -8,19 +8,60 @@ Generates player positioning heat maps from event data:
 - Interactive canvas with field overlay
 """
 
+import base64
+import hashlib
 import math
+from collections import defaultdict
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 import json
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Field dimensions (normalized 0-1)
 FIELD_WIDTH = 1.0
 FIELD_HEIGHT = 0.65  # Standard soccer field ratio
 
+HEATMAP_CACHE_TTL = 600
+
+# Heat map weight per event type (anything else counts as 1.0)
+_EVENT_WEIGHTS = {
+    'goal': 3.0,
+    'shot': 2.0,
+    'shot_on_target': 2.0,
+    'assist': 2.0,
+    'save': 2.5,
+    'save_diving': 2.5,
+    'tackle': 1.5,
+    'interception': 1.5,
+    'pass': 0.5,
+    'dribble': 1.0,
+}
+
+
+@lru_cache(maxsize=None)
+def _gaussian_kernel(radius: int) -> Tuple[float, ...]:
+    """1D falloff weights exp(-d^2 / 2r) for offsets d in [-radius, radius]."""
+    return tuple(math.exp(-(d * d) / (2 * radius)) for d in range(-radius, radius + 1))
+
+
+def _blur_axis(grid: np.ndarray, kernel: Tuple[float, ...], axis: int) -> np.ndarray:
+    """Convolve grid with a symmetric 1D kernel along one axis, zero-padded."""
+    radius = len(kernel) // 2
+    lines = np.swapaxes(grid, 0, axis)
+    size = lines.shape[0]
+    padded = np.pad(lines, ((radius, radius), (0, 0)))
+
+    out = np.zeros_like(lines)
+    for i, k in enumerate(kernel):
+        out += k * padded[i:i + size]
+    return np.swapaxes(out, 0, axis)
+
 
 @dataclass
 class PositionPoint:
@@ -38,7 +79,7 @@ class HeatMapData:
     player_id: int
     player_name: str
     points: List[PositionPoint]
-    grid: List[List[float]]  # 2D intensity grid
+    grid: np.ndarray  # 2D intensity grid, shape (GRID_HEIGHT, GRID_WIDTH)
     max_intensity: float
     game_id: Optional[int] = None
     time_range: Optional[Tuple[float, float]] = None
@@ -94,62 +135,57 @@ class HeatMapService:
             return None
 
         # Get position data from events
-        query = self.db.query(GameEvent).filter(
-            GameEvent.player_id == player_id,
-            GameEvent.field_position_x.isnot(None),
-            GameEvent.field_position_y.isnot(None)
-        )
+        query = self._position_query().filter(GameEvent.player_id == player_id)
 
         if game_id:
             query = query.filter(GameEvent.game_id == game_id)
+        if time_start is not None:
+            query = query.filter(GameEvent.timestamp_seconds >= time_start)
+        if time_end is not None:
+            query = query.filter(GameEvent.timestamp_seconds <= time_end)
 
-        events = query.all()
-
-        # Convert to position points
-        points = []
-        for event in events:
-            # Apply time filter
-            if time_start and event.timestamp_seconds < time_start:
-                continue
-            if time_end and event.timestamp_seconds > time_end:
-                continue
+        return self._build_heatmap(player, query.all(), game_id, time_start, time_end)
 
-            # Weight by event importance
-            weight = self._get_event_weight(event.event_type.value if event.event_type else None)
-
-            points.append(PositionPoint(
-                x=event.field_position_x,
-                y=event.field_position_y,
-                timestamp=event.timestamp_seconds,
-                event_type=event.event_type.value if event.event_type else None,
-                weight=weight
-            ))
+    def events_version(
+        self,
+        player_id: Optional[int] = None,
+        game_id: Optional[int] = None
+    ) -> str:
+        """
+        Cheap fingerprint of a player's and/or game's events, used to key
+        cached heat maps and their ETags.
+
+        Count and max id change whenever events are ingested or deleted.
+        Events have no updated_at, so corrections are caught by id-weighted
+        sums of every column a heat map reads (position, type, time,
+        player): editing any of them on any event changes a sum, and the
+        id weighting keeps values swapped between events from cancelling.
+        The id is widened to BIGINT first: on PostgreSQL an int4 x int4
+        product (id x player_id, id x type code) overflows at large ids.
+        """
+        from ..models import EventType, GameEvent
+        from sqlalchemy import BigInteger, case, cast, func
 
-        if not points:
-            # Return empty heat map
-            return HeatMapData(
-                player_id=player_id,
-                player_name=player.full_name,
-                points=[],
-                grid=self._empty_grid(),
-                max_intensity=0,
-                game_id=game_id,
-                time_range=(time_start, time_end) if time_start or time_end else None
+        type_code = case(
+            *((GameEvent.event_type == event_type, code)
+              for code, event_type in enumerate(EventType, start=1)),
+            else_=0
+        )
+        weight = cast(GameEvent.id, BigInteger)
+        checksums = [
+            func.sum(weight * column) for column in (
+                GameEvent.field_position_x, GameEvent.field_position_y,
+                GameEvent.timestamp_seconds, GameEvent.player_id, type_code
             )
+        ]
 
-        # Generate intensity grid
-        grid = self._generate_grid(points)
-        max_intensity = max(max(row) for row in grid) if grid else 0
+        query = self.db.query(func.count(GameEvent.id), func.max(GameEvent.id), *checksums)
+        if player_id:
+            query = query.filter(GameEvent.player_id == player_id)
+        if game_id:
+            query = query.filter(GameEvent.game_id == game_id)
 
-        return HeatMapData(
-            player_id=player_id,
-            player_name=player.full_name,
-            points=points,
-            grid=grid,
-            max_intensity=max_intensity,
-            game_id=game_id,
-            time_range=(time_start, time_end) if time_start or time_end else None
-        )
+        return '-'.join(str(value) for value in query.one())
 
     def generate_team_heatmap(
         self,
@@ -162,33 +198,50 @@ class HeatMapService:
 
         Returns dict mapping player_id to HeatMapData.
         """
-        from ..models import Team, Player, team_player
+        from ..models import Team, GameEvent
 
         team = self.db.query(Team).get(team_id)
         if not team:
             return {}
 
-        result = {}
-        for player in team.players:
+        players = [
+            player for player in team.players
             # Optionally skip goalkeepers
-            if exclude_goalkeeper and player.default_position and \
-               player.default_position.value == 'goalkeeper':
-                continue
+            if not (exclude_goalkeeper and player.default_position and
+                    player.default_position.value == 'goalkeeper')
+        ]
+        if not players:
+            return {}
 
-            heatmap = self.generate_player_heatmap(player.id, game_id)
-            if heatmap:
-                result[player.id] = heatmap
+        # One query for the whole squad rather than one per player
+        query = self._position_query().filter(
+            GameEvent.player_id.in_([player.id for player in players])
+        )
+
+        if game_id:
+            query = query.filter(GameEvent.game_id == game_id)
 
-        return result
+        events_by_player = defaultdict(list)
+        for event in query.all():
+            events_by_player[event.player_id].append(event)
+
+        return {
+            player.id: self._build_heatmap(player, events_by_player[player.id], game_id)
+            for player in players
+        }
 
     def generate_combined_heatmap(
         self,
         game_id: int,
-        team_id: Optional[int] = None
+        team_id: Optional[int] = None,
+        grid_only: bool = False
     ) -> HeatMapData:
         """
         Generate a combined heat map for all players in a game.
         Shows overall team positioning.
+
+        With grid_only, events are binned and weighted in the database and
+        the result has no per-event points (no overlay dots).
         """
         from ..models import GameEvent, Game
 
@@ -196,111 +249,240 @@ class HeatMapService:
         if not game:
             return None
 
-        query = self.db.query(GameEvent).filter(
-            GameEvent.game_id == game_id,
+        query = self._position_query().filter(GameEvent.game_id == game_id)
+
+        if team_id:
+            from ..models import team_player
+            from sqlalchemy import select
+
+            # Filter to players on this team
+            query = query.filter(GameEvent.player_id.in_(
+                select(team_player.c.player_id).where(team_player.c.team_id == team_id)
+            ))
+
+        if grid_only:
+            points = []
+            grid = self._aggregate_grid(query)
+        else:
+            points = [
+                PositionPoint(
+                    x=e.field_position_x,
+                    y=e.field_position_y,
+                    timestamp=e.timestamp_seconds,
+                    event_type=e.event_type.value if e.event_type else None,
+                    weight=self._get_event_weight(e.event_type.value if e.event_type else None)
+                )
+                for e in query.all()
+            ]
+            grid = self._generate_grid(points) if points else self._empty_grid()
+        max_intensity = float(grid.max())
+
+        return HeatMapData(
+            player_id=0,  # Combined
+            player_name="Team",
+            points=points,
+            grid=grid,
+            max_intensity=max_intensity,
+            game_id=game_id
+        )
+
+    def _position_query(self):
+        """
+        Query the event columns a heat map needs, for events with a position.
+
+        Selecting columns rather than GameEvent entities keeps full ORM
+        objects out of the identity map; rows still expose the same
+        attribute names.
+        """
+        from ..models import GameEvent
+
+        return self.db.query(
+            GameEvent.player_id,
+            GameEvent.field_position_x,
+            GameEvent.field_position_y,
+            GameEvent.timestamp_seconds,
+            GameEvent.event_type
+        ).filter(
             GameEvent.field_position_x.isnot(None),
             GameEvent.field_position_y.isnot(None)
         )
 
-        if team_id:
-            from ..models import Player, team_player
-            from sqlalchemy import and_
+    def _build_heatmap(
+        self,
+        player,
+        events: List,
+        game_id: Optional[int] = None,
+        time_start: Optional[float] = None,
+        time_end: Optional[float] = None
+    ) -> HeatMapData:
+        """
+        Build a player's heat map from their already-loaded events.
 
-            # Filter to players on this team
-            player_ids = [p.id for p in self.db.query(Player).join(
-                team_player, Player.id == team_player.c.player_id
-            ).filter(team_player.c.team_id == team_id).all()]
+        Events must already be filtered to the requested time range;
+        time_start/time_end are only recorded on the result.
+        """
+        # Convert to position points
+        points = []
+        for event in events:
+            # Weight by event importance
+            weight = self._get_event_weight(event.event_type.value if event.event_type else None)
 
-            query = query.filter(GameEvent.player_id.in_(player_ids))
+            points.append(PositionPoint(
+                x=event.field_position_x,
+                y=event.field_position_y,
+                timestamp=event.timestamp_seconds,
+                event_type=event.event_type.value if event.event_type else None,
+                weight=weight
+            ))
 
-        events = query.all()
+        time_range = (time_start, time_end) \
+            if time_start is not None or time_end is not None else None
 
-        points = [
-            PositionPoint(
-                x=e.field_position_x,
-                y=e.field_position_y,
-                timestamp=e.timestamp_seconds,
-                event_type=e.event_type.value if e.event_type else None,
-                weight=self._get_event_weight(e.event_type.value if e.event_type else None)
+        if not points:
+            # Return empty heat map
+            return HeatMapData(
+                player_id=player.id,
+                player_name=player.full_name,
+                points=[],
+                grid=self._empty_grid(),
+                max_intensity=0,
+                game_id=game_id,
+                time_range=time_range
             )
-            for e in events
-        ]
 
-        grid = self._generate_grid(points) if points else self._empty_grid()
-        max_intensity = max(max(row) for row in grid) if grid else 0
+        # Generate intensity grid
+        grid = self._generate_grid(points)
+        max_intensity = float(grid.max())
 
         return HeatMapData(
-            player_id=0,  # Combined
-            player_name="Team",
+            player_id=player.id,
+            player_name=player.full_name,
             points=points,
             grid=grid,
             max_intensity=max_intensity,
-            game_id=game_id
+            game_id=game_id,
+            time_range=time_range
         )
 
-    def _generate_grid(self, points: List[PositionPoint]) -> List[List[float]]:
-        """Generate intensity grid from position points."""
-        grid = self._empty_grid()
+    def _generate_grid(self, points: List[PositionPoint]) -> np.ndarray:
+        """
+        Generate intensity grid from position points.
+
+        Every point adds a gaussian stamp centred on its grid cell. Because
+        exp(-(dx^2 + dy^2) / 2r) factors into exp(-dx^2 / 2r) * exp(-dy^2 / 2r),
+        the points are first accumulated as weighted deltas and then blurred
+        with the 1D kernel along each axis. Stamp cells that would fall off
+        the field are dropped by the zero padding, exactly as before.
+        """
+        width, height = self.GRID_WIDTH, self.GRID_HEIGHT
+        if not points:
+            return self._empty_grid()
+
+        coords = np.fromiter(
+            ((p.x, p.y, p.weight) for p in points),
+            dtype=np.dtype((np.float64, 3)),
+            count=len(points)
+        )
+
+        # Map points to grid cells, clamped to the valid range
+        gx = np.clip((coords[:, 0] * (width - 1)).astype(np.int64), 0, width - 1)
+        gy = np.clip((coords[:, 1] * (height - 1)).astype(np.int64), 0, height - 1)
+
+        deltas = np.bincount(
+            gy * width + gx, weights=coords[:, 2], minlength=width * height
+        ).reshape(height, width)
+
+        return self._blur(deltas)
+
+    def _aggregate_grid(self, query) -> np.ndarray:
+        """
+        Generate intensity grid with the per-cell binning done in SQL.
+
+        query is a _position_query(); it is regrouped by grid cell so at most
+        GRID_WIDTH * GRID_HEIGHT rows of summed event weights come back.
+        """
+        from ..models import EventType, GameEvent
+        from sqlalchemy import Integer, case, cast, func
+
+        width, height = self.GRID_WIDTH, self.GRID_HEIGHT
+
+        if self._sql_has_floor():
+            cell = func.floor
+        else:
+            # CAST truncates toward zero like int() in _generate_grid; it
+            # only differs from floor() below zero, which is clamped anyway
+            def cell(value):
+                return cast(value, Integer)
+
+        gx = cell(GameEvent.field_position_x * (width - 1)).label('gx')
+        gy = cell(GameEvent.field_position_y * (height - 1)).label('gy')
+        weight = case(
+            *((GameEvent.event_type == EventType(event_type), w)
+              for event_type, w in _EVENT_WEIGHTS.items()),
+            else_=1.0
+        )
 
-        for point in points:
-            # Map point to grid cell
-            gx = int(point.x * (self.GRID_WIDTH - 1))
-            gy = int(point.y * (self.GRID_HEIGHT - 1))
+        # Group by the select labels so the cell expressions (and their bound
+        # parameters) are not repeated in GROUP BY
+        rows = query.with_entities(gx, gy, func.sum(weight)).group_by('gx', 'gy').all()
+        if not rows:
+            return self._empty_grid()
 
-            # Clamp to valid range
-            gx = max(0, min(self.GRID_WIDTH - 1, gx))
-            gy = max(0, min(self.GRID_HEIGHT - 1, gy))
+        cells = np.array(rows, dtype=np.float64)
 
-            # Add weighted intensity with gaussian spread
-            for dx in range(-self.BLUR_RADIUS, self.BLUR_RADIUS + 1):
-                for dy in range(-self.BLUR_RADIUS, self.BLUR_RADIUS + 1):
-                    nx, ny = gx + dx, gy + dy
-                    if 0 <= nx < self.GRID_WIDTH and 0 <= ny < self.GRID_HEIGHT:
-                        # Gaussian falloff
-                        dist = math.sqrt(dx*dx + dy*dy)
-                        falloff = math.exp(-dist*dist / (2 * self.BLUR_RADIUS))
-                        grid[ny][nx] += point.weight * falloff
+        # Clamp out-of-range cells, as _generate_grid does per point
+        cx = np.clip(cells[:, 0].astype(np.int64), 0, width - 1)
+        cy = np.clip(cells[:, 1].astype(np.int64), 0, height - 1)
 
-        return grid
+        deltas = np.bincount(
+            cy * width + cx, weights=cells[:, 2], minlength=width * height
+        ).reshape(height, width)
 
-    def _empty_grid(self) -> List[List[float]]:
+        return self._blur(deltas)
+
+    def _sql_has_floor(self) -> bool:
+        """
+        Whether the database has floor(). SQLite only does when built with
+        its optional math functions, so it is never relied on there.
+        """
+        return self.db.get_bind().dialect.name != 'sqlite'
+
+    def _blur(self, deltas: np.ndarray) -> np.ndarray:
+        """Spread per-cell weights with the separable gaussian kernel."""
+        kernel = _gaussian_kernel(self.BLUR_RADIUS)
+        grid = _blur_axis(_blur_axis(deltas, kernel, axis=1), kernel, axis=0)
+        return grid.astype(np.float32)
+
+    def _empty_grid(self) -> np.ndarray:
         """Create empty intensity grid."""
-        return [[0.0] * self.GRID_WIDTH for _ in range(self.GRID_HEIGHT)]
+        return np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=np.float32)
 
     def _get_event_weight(self, event_type: Optional[str]) -> float:
         """Get importance weight for event type."""
-        weights = {
-            'goal': 3.0,
-            'shot': 2.0,
-            'shot_on_target': 2.0,
-            'assist': 2.0,
-            'save': 2.5,
-            'save_diving': 2.5,
-            'tackle': 1.5,
-            'interception': 1.5,
-            'pass': 0.5,
-            'dribble': 1.0,
-        }
-        return weights.get(event_type, 1.0)
+        return _EVENT_WEIGHTS.get(event_type, 1.0)
 
     def to_canvas_data(self, heatmap: HeatMapData) -> Dict:
         """
         Convert heat map to format suitable for canvas rendering.
 
         Returns JSON-serializable dict with:
-        - grid: 2D intensity array (normalized 0-1)
+        - gridB64: base64 row-major uint8 intensities (0-255 = normalized 0-1)
         - points: List of event points for overlay
         - meta: Player/game info
         """
-        # Normalize grid to 0-1
-        normalized_grid = []
-        max_val = heatmap.max_intensity or 1
+        # Normalize grid to 0-1 (one vectorized float32 divide; an empty map
+        # is already all zeros)
+        if heatmap.max_intensity:
+            normalized_grid = heatmap.grid / np.float32(heatmap.max_intensity)
+        else:
+            normalized_grid = heatmap.grid
 
-        for row in heatmap.grid:
-            normalized_grid.append([v / max_val for v in row])
+        # Colors are bucketed client-side, so 8 bits per cell is plenty and
+        # ships far fewer bytes than a nested list of floats
+        quantized = np.rint(normalized_grid * 255).clip(0, 255).astype(np.uint8)
 
         return {
-            'grid': normalized_grid,
+            'gridB64': base64.b64encode(quantized.tobytes()).decode('ascii'),
             'gridWidth': self.GRID_WIDTH,
             'gridHeight': self.GRID_HEIGHT,
             'points': [
@@ -328,10 +510,14 @@ class HeatMapService:
 
 def register_heatmap_routes(app, db):
     """Register heat map API routes."""
-    from flask import jsonify, request, render_template_string, session, redirect, url_for, g
-    from ..auth import get_user_team_ids
+    from flask import (
+        current_app, jsonify, request, render_template_string, session, redirect, url_for, g
+    )
+    from ..auth import get_user_team_ids, ojsonify
+    from ..cache import ResponseCache, heatmap_player_key
 
     service = HeatMapService(db)
+    cache = app.config.get('cache') or ResponseCache()
 
     def _get_authorized_team_ids(user_id: int) -> set:
         """Get authorized team IDs, cached per request."""
@@ -353,6 +539,27 @@ def register_heatmap_routes(app, db):
                 return True
         return False
 
+    def _conditional(response, etag: str, game_id: Optional[int]):
+        """
+        Tag a heat map response for browser caching.
+
+        Maps of a processed game only change if events are corrected, so
+        they are kept for a day; anything else revalidates after a minute.
+        """
+        from ..models import Game
+
+        game = db.query(Game).get(game_id) if game_id else None
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, max-age=86400' \
+            if game and game.is_processed else 'private, max-age=60'
+        return response
+
+    def _not_modified(etag: str, game_id: Optional[int]):
+        """304 response if the client already has this version, else None."""
+        if etag in request.if_none_match:
+            return _conditional(current_app.response_class(status=304), etag, game_id)
+        return None
+
     def _user_can_access_team(user_id: int, team_id: int) -> bool:
         """Check if user has access to view team's heatmap."""
         return team_id in _get_authorized_team_ids(user_id)
@@ -385,6 +592,20 @@ def register_heatmap_routes(app, db):
         time_start = request.args.get('time_start', type=float)
         time_end = request.args.get('time_end', type=float)
 
+        # Viewer time-slice toggles re-request the same few payloads
+        cache_key = heatmap_player_key(
+            player_id, game_id, time_start, time_end,
+            service.events_version(player_id, game_id)
+        )
+        etag = hashlib.sha1(cache_key.encode()).hexdigest()
+        not_modified = _not_modified(etag, game_id)
+        if not_modified:
+            return not_modified
+
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return _conditional(ojsonify(payload), etag, game_id)
+
         heatmap = service.generate_player_heatmap(
             player_id, game_id, time_start, time_end
         )
@@ -392,7 +613,9 @@ def register_heatmap_routes(app, db):
         if not heatmap:
             return jsonify({'error': 'Player not found'}), 404
 
-        return jsonify(service.to_canvas_data(heatmap))
+        payload = service.to_canvas_data(heatmap)
+        cache.set(cache_key, payload, timeout=HEATMAP_CACHE_TTL)
+        return _conditional(ojsonify(payload), etag, game_id)
 
     @app.route('/api/heatmap/team/<int:team_id>')
     def api_team_heatmap(team_id: int):
@@ -413,7 +636,7 @@ def register_heatmap_routes(app, db):
 
         heatmaps = service.generate_team_heatmap(team_id, game_id)
 
-        return jsonify({
+        return ojsonify({
             'players': {
                 pid: service.to_canvas_data(hm)
                 for pid, hm in heatmaps.items()
@@ -437,12 +660,21 @@ def register_heatmap_routes(app, db):
         if team_id is not None and not _user_can_access_team(user_id, team_id):
             return jsonify({'error': 'Access denied to this team'}), 403
 
-        heatmap = service.generate_combined_heatmap(game_id, team_id)
+        grid_only = request.args.get('grid_only', 'false').lower() in ('true', '1', 'yes')
+
+        etag = hashlib.sha1(
+            f'{game_id}:{team_id}:{grid_only}:{service.events_version(game_id=game_id)}'.encode()
+        ).hexdigest()
+        not_modified = _not_modified(etag, game_id)
+        if not_modified:
+            return not_modified
+
+        heatmap = service.generate_combined_heatmap(game_id, team_id, grid_only)
 
         if not heatmap:
             return jsonify({'error': 'Game not found'}), 404
 
-        return jsonify(service.to_canvas_data(heatmap))
+        return _conditional(ojsonify(service.to_canvas_data(heatmap)), etag, game_id)
 
     @app.route('/heatmap/player/<int:player_id>')
     def view_player_heatmap(player_id: int):
@@ -567,13 +799,14 @@ HEATMAP_VIEWER_HTML = """
             // Draw field
             drawField();
 
-            // Draw heat map
+            // Draw heat map (row-major uint8 intensities, base64 encoded)
             const cellWidth = canvas.width / data.gridWidth;
             const cellHeight = canvas.height / data.gridHeight;
+            const grid = Uint8Array.from(atob(data.gridB64), c => c.charCodeAt(0));
 
             for (let y = 0; y < data.gridHeight; y++) {
                 for (let x = 0; x < data.gridWidth; x++) {
-                    const intensity = data.grid[y][x];
+                    const intensity = grid[y * data.gridWidth + x] / 255;
                     if (intensity > 0.05) {
                         ctx.fillStyle = getHeatColor(intensity);
                         ctx.fillRect(x * cellWidth, y * cellHeight, cellWidth + 1, cellHeight + 1);
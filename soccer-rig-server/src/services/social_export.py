@@ -8,11 +8,19 @@ Generates vertical 9:16 clips optimized for social media:
 - Watermark/branding support
 """
 
+import gzip
+import hashlib
 import os
 import subprocess
 import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from fractions import Fraction
 from datetime import datetime
 import logging
 import json
@@ -24,6 +32,55 @@ ASPECT_9_16 = (9, 16)  # Vertical (TikTok, Reels, Shorts)
 ASPECT_1_1 = (1, 1)    # Square (Instagram feed)
 ASPECT_16_9 = (16, 9)  # Horizontal (YouTube, Twitter)
 
+# Video encoder arguments: NVIDIA hardware encoding when a GPU is usable,
+# libx264 on the CPU otherwise (same target quality; x264 preset and tune
+# come from SocialClipConfig). Rate control is added per export, see
+# SocialMediaExporter._encoder_args
+NVENC_ARGS = ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr']
+X264_ARGS = ['-c:v', 'libx264']
+
+# Audio bitrate (kbps) of every export
+AUDIO_KBPS = 128
+
+# ffmpeg stderr lines kept for error reporting
+FFMPEG_STDERR_LINES = 200
+
+# Source videos whose ffprobe metadata is kept in memory
+PROBE_CACHE_SIZE = 128
+
+# With Redis, exports run in the background so encodes don't hold request
+# threads; the pool size caps concurrent encodes per server process
+_export_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('SOCIAL_EXPORT_WORKERS', '1')),
+    thread_name_prefix='social-export'
+)
+SOCIAL_JOB_TTL = 3600
+
+# A job still queued or running this long after it was queued is reported
+# failed: its worker restarted or the pool shut down, and nothing will ever
+# finish it. Allows a base wait plus wall time per second of output
+SOCIAL_JOB_TIMEOUT_BASE = 300
+SOCIAL_JOB_TIMEOUT_PER_SECOND = 10
+
+# Characters with special meaning in the ffmpeg drawtext filter
+_DRAWTEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    "'": r"\'",
+    ':': '\\:',
+    ';': '\\;',  # Command separator
+    '%': '%%',   # FFmpeg format specifier
+    '[': '\\[',
+    ']': '\\]',
+})
+
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes, or 0 if it doesn't exist (one stat call)."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
 
 @dataclass
 class SocialClipConfig:
@@ -32,6 +89,22 @@ class SocialClipConfig:
     max_duration: int = 60  # seconds
     output_resolution: Tuple[int, int] = (1080, 1920)  # width, height for 9:16
     fps: int = 30
+    # Frame-accurate start; off starts at the preceding keyframe, which is
+    # faster and only shifts the clip by a fraction of a second
+    accurate_seek: bool = False
+    # Fragmented MP4 is written front to back in one pass; faststart needs a
+    # full rewrite after encoding but suits players without fMP4 support
+    fragmented: bool = True
+    # libx264 only; CRF stays 23. 'medium' is still worth it for
+    # archive-quality exports, at roughly 4x the encode time
+    x264_preset: str = 'veryfast'
+    x264_tune: str = 'film'
+    # libx264 threads per encode; throughput per stream flattens out past
+    # ~4, and the default (1.5x cores) oversubscribes concurrent exports
+    encode_threads: int = 4
+    # Cap the output file size (MB) for platform upload limits: bitrate
+    # targeted (two-pass on libx264) instead of constant quality
+    target_file_mb: Optional[int] = None
 
     # Overlay options
     show_player_name: bool = True
@@ -58,8 +131,43 @@ class SocialMediaExporter:
     with automatic cropping to follow the action.
     """
 
+    # Encoder probe result, shared by every exporter in the process
+    _encoder: Optional[str] = None
+
     def __init__(self, config: Optional[SocialClipConfig] = None):
         self.config = config or SocialClipConfig()
+        self.encoder = self._detect_encoder()
+
+        # LRU of ffprobe results, shared by concurrent requests
+        self._probe_cache: 'OrderedDict[Tuple[str, int, int], Dict]' = OrderedDict()
+        self._probe_lock = threading.Lock()
+
+    @classmethod
+    def _detect_encoder(cls) -> str:
+        """Pick h264_nvenc if an NVIDIA GPU can encode, else libx264 (probed once)."""
+        if cls._encoder is None:
+            cls._encoder = 'h264_nvenc' if cls._nvenc_available() else 'libx264'
+            logger.info(f"Social export video encoder: {cls._encoder}")
+        return cls._encoder
+
+    @staticmethod
+    def _nvenc_available() -> bool:
+        """
+        Check that h264_nvenc actually works here.
+
+        ffmpeg builds often list the encoder without a usable GPU, so encode a
+        few blank frames instead of only checking `ffmpeg -encoders`.
+        """
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+            '-c:v', 'h264_nvenc', '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0
 
     def export_clip(
         self,
@@ -91,68 +199,45 @@ class SocialMediaExporter:
             Dict with export status and metadata
         """
         try:
-            # Get source video info
-            probe = self._probe_video(source_video)
-            src_width = probe['width']
-            src_height = probe['height']
-
-            # Calculate crop dimensions for 9:16 from source
             target_w, target_h = self.config.output_resolution
-            target_ratio = target_w / target_h
-
-            # Calculate crop region from source
-            # For 9:16 output from a wide panorama, we take a vertical slice
-            crop_height = src_height
-            crop_width = int(crop_height * target_ratio)
-
-            # Ensure crop doesn't exceed source
-            if crop_width > src_width:
-                crop_width = src_width
-                crop_height = int(crop_width / target_ratio)
-
-            # Calculate X position for crop (centered on focus_x)
-            max_x = src_width - crop_width
-            crop_x = int(focus_x * max_x)
-            crop_x = max(0, min(crop_x, max_x))
-            crop_y = (src_height - crop_height) // 2
 
             # Clamp duration
             duration = min(duration, self.config.max_duration)
 
+            # Cached per source, so clips from one panorama probe it once
+            probe = self._probe_video(source_video)
+
             # Build FFmpeg filter chain
             filters = self._build_filter_chain(
-                crop_x, crop_y, crop_width, crop_height,
+                self._crop_filter(focus_x),
                 player_name, event_type, score, game_info
             )
 
             # Run FFmpeg
             cmd = [
-                'ffmpeg', '-y',
-                '-ss', str(start_time),
+                'ffmpeg', '-y', '-hide_banner', '-nostats', '-loglevel', 'error',
+                *self._seek_args(start_time),
                 '-i', source_video,
                 '-t', str(duration),
                 '-vf', filters,
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '23',
-                '-c:a', 'aac',
-                '-b:a', '128k',
+                *self._encoder_args(duration),
+                *self._audio_args(probe),
                 '-r', str(self.config.fps),
-                '-movflags', '+faststart',
+                '-movflags', self._movflags(),
                 output_path
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr = self._run_encode(cmd, duration)
 
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"FFmpeg error: {stderr}")
                 return {
                     'success': False,
-                    'error': result.stderr
+                    'error': stderr
                 }
 
             # Get output file info
-            output_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            output_size = _file_size(output_path)
 
             return {
                 'success': True,
@@ -171,12 +256,167 @@ class SocialMediaExporter:
                 'error': str(e)
             }
 
+    def export_key(self, source_video: str, **export_args) -> str:
+        """
+        Content key for an export_clip() call.
+
+        Hashes everything that determines the output: the arguments, the
+        source file's mtime, the encoder and the config. Any change to them
+        gives a new key, so a file named by it can be reused as-is.
+        """
+        return hashlib.sha1(json.dumps({
+            **export_args,
+            'source_video': source_video,
+            'source_mtime': os.stat(source_video).st_mtime_ns,
+            'encoder': self.encoder,
+            'config': asdict(self.config)
+        }, sort_keys=True).encode()).hexdigest()
+
+    def _audio_args(self, probe: Dict) -> List[str]:
+        """
+        Audio codec options for a single-source export.
+
+        Audio is never filtered, so an AAC source track can be copied as-is
+        instead of decoded and re-encoded.
+        """
+        if probe['audio_codec'] == 'aac':
+            return ['-c:a', 'copy']
+        return ['-c:a', 'aac', '-b:a', f'{AUDIO_KBPS}k']
+
+    def _seek_args(self, start_time: float) -> List[str]:
+        """Input options placed before a source's -i: decoder and seek."""
+        args = []
+        if self.encoder == 'h264_nvenc':
+            # Decode on the GPU too; frames come back to system memory for
+            # the crop/drawtext filters and NVENC uploads them again
+            args += ['-hwaccel', 'cuda']
+        args += ['-ss', str(start_time)]
+        if not self.config.accurate_seek:
+            # Start at the keyframe before start_time instead of decoding
+            # and discarding the frames up to it
+            args.append('-noaccurate_seek')
+        return args
+
+    def _video_kbps(self, duration: float) -> Optional[int]:
+        """Video bitrate keeping the file under target_file_mb, or None for CRF."""
+        if not self.config.target_file_mb or duration <= 0:
+            return None
+        # Leave 5% for container overhead, plus room for the audio track
+        total_kbps = self.config.target_file_mb * 8192 / duration * 0.95
+        return max(int(total_kbps) - AUDIO_KBPS, 100)
+
+    def _encoder_args(self, duration: float) -> List[str]:
+        """Output video codec and rate control options for the selected encoder."""
+        kbps = self._video_kbps(duration)
+
+        if self.encoder == 'h264_nvenc':
+            if kbps:
+                # Single pass: VBR held to the target by maxrate/bufsize
+                return NVENC_ARGS + [
+                    '-b:v', f'{kbps}k', '-maxrate', f'{kbps * 3 // 2}k',
+                    '-bufsize', f'{kbps * 2}k'
+                ]
+            return NVENC_ARGS + ['-cq', '23', '-b:v', '0']
+
+        rate = ['-b:v', f'{kbps}k'] if kbps else ['-crf', '23']
+        return ['-threads', str(self.config.encode_threads)] + X264_ARGS + rate + [
+            '-preset', self.config.x264_preset, '-tune', self.config.x264_tune
+        ]
+
+    def _run_encode(self, cmd: List[str], duration: float) -> Tuple[int, str]:
+        """
+        Run a complete export command (output path last).
+
+        Bitrate-targeted libx264 exports are encoded in two passes so the
+        file lands on the size target; everything else runs once.
+        """
+        if self.encoder == 'h264_nvenc' or not self._video_kbps(duration):
+            return self._run_ffmpeg(cmd)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            passlog = ['-passlogfile', os.path.join(temp_dir, 'ffmpeg2pass')]
+            # Pass 1 only gathers rate statistics; discard its output
+            returncode, stderr = self._run_ffmpeg(
+                cmd[:-1] + ['-pass', '1', *passlog, '-f', 'null', os.devnull]
+            )
+            if returncode != 0:
+                return returncode, stderr
+            return self._run_ffmpeg(cmd[:-1] + ['-pass', '2', *passlog, cmd[-1]])
+
+    def _movflags(self) -> str:
+        """MP4 layout: fragmented (moov up front, no rewrite) or faststart."""
+        if self.config.fragmented:
+            return '+frag_keyframe+empty_moov+default_base_moof'
+        # Moves moov to the front with a second pass over the whole file
+        return '+faststart'
+
+    def _run_ffmpeg(self, cmd: List[str]) -> Tuple[int, str]:
+        """
+        Run ffmpeg, returning (returncode, last lines of stderr).
+
+        stderr is streamed through a bounded buffer rather than captured
+        whole, so a long or failing encode cannot grow the worker's memory.
+        """
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, errors='replace'
+        )
+        tail = deque(proc.stderr, maxlen=FFMPEG_STDERR_LINES)
+        proc.wait()
+        return proc.returncode, ''.join(tail)
+
+    def _crop_filter(self, focus_x: float) -> str:
+        """
+        Crop filter taking the output aspect ratio from the source.
+
+        For 9:16 output from a wide panorama this is a full-height vertical
+        slice centred on focus_x. The size comes from ffmpeg's in_w/in_h
+        expressions, evaluated when the graph starts, so no ffprobe is needed.
+        """
+        target_w, target_h = self.config.output_resolution
+        ratio = target_w / target_h
+        focus_x = max(0.0, min(focus_x, 1.0))
+
+        # Full height, unless the slice would be wider than the source
+        width = f"min(iw,trunc(ih*{ratio}))"
+        height = f"if(gt(trunc(ih*{ratio}),iw),trunc(iw/{ratio}),ih)"
+        return (
+            f"crop=w='{width}':h='{height}'"
+            f":x='trunc((iw-ow)*{focus_x})':y='trunc((ih-oh)/2)'"
+        )
+
     def _probe_video(self, video_path: str) -> Dict:
-        """Get video metadata using ffprobe."""
+        """
+        Get video metadata using ffprobe.
+
+        Results are cached per (path, mtime, size): reels cut from the same
+        game panorama only pay for the ffprobe process once.
+        """
+        stat = os.stat(video_path)
+        key = (video_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._probe_lock:
+            probe = self._probe_cache.get(key)
+            if probe is not None:
+                self._probe_cache.move_to_end(key)
+                return probe
+
+        probe = self._run_ffprobe(video_path)
+
+        with self._probe_lock:
+            self._probe_cache[key] = probe
+            if len(self._probe_cache) > PROBE_CACHE_SIZE:
+                self._probe_cache.popitem(last=False)
+        return probe
+
+    def _run_ffprobe(self, video_path: str) -> Dict:
+        """Run ffprobe for a video's stream metadata."""
+        # Only the fields used below; codec_type/codec_name for every stream
+        # is enough to tell whether there is audio and how it is encoded
         cmd = [
             'ffprobe', '-v', 'quiet',
             '-print_format', 'json',
-            '-show_streams',
+            '-show_entries', 'stream=codec_type,codec_name,width,height,duration,r_frame_rate',
             video_path
         ]
         result = subprocess.run(cmd, capture_output=True, text=True)
@@ -190,22 +430,28 @@ class SocialMediaExporter:
         if not video_stream:
             raise ValueError("No video stream found")
 
+        audio_stream = next(
+            (s for s in data['streams'] if s['codec_type'] == 'audio'),
+            None
+        )
+
         return {
             'width': int(video_stream['width']),
             'height': int(video_stream['height']),
+            'has_audio': audio_stream is not None,
+            'audio_codec': audio_stream.get('codec_name') if audio_stream else None,
             'duration': float(video_stream.get('duration', 0)),
             'fps': self._parse_frame_rate(video_stream.get('r_frame_rate', '30/1'))
         }
 
     def _parse_frame_rate(self, rate_str: str) -> float:
-        """Safely parse frame rate string like '30/1' or '30'."""
+        """Safely parse frame rate string like '30000/1001', '30/1' or '30'."""
         try:
-            if '/' in rate_str:
-                num, denom = rate_str.split('/', 1)
-                return float(num) / float(denom)
-            return float(rate_str)
+            rate = Fraction(rate_str)
         except (ValueError, ZeroDivisionError):
             return 30.0  # Default fallback
+        # ffprobe reports '0/0' (or '0/1') when the rate is unknown
+        return float(rate) if rate else 30.0
 
     def _sanitize_text(self, text: str) -> str:
         """
@@ -220,40 +466,35 @@ class SocialMediaExporter:
         # Limit text length to prevent buffer issues
         text = text[:100]
         
-        # Remove any control characters and newlines
-        text = ''.join(c for c in text if c.isprintable() and c not in '\n\r\t')
-        
+        # Remove any control characters and newlines (rare, so only scan
+        # per character when the string is not already all printable)
+        if not text.isprintable():
+            text = ''.join(c for c in text if c.isprintable())
+
         # Escape characters that have special meaning in FFmpeg drawtext filter
-        # Order matters: escape backslash first
-        text = text.replace('\\', '\\\\')
-        text = text.replace("'", r"\'")
-        text = text.replace(':', '\\:')
-        text = text.replace(';', '\\;')  # Command separator
-        text = text.replace('%', '%%')   # FFmpeg format specifier
-        text = text.replace('[', '\\[')
-        text = text.replace(']', '\\]')
-        
-        return text
+        # (one pass; the table maps each character at once, so escapes are
+        # never re-escaped)
+        return text.translate(_DRAWTEXT_ESCAPES)
 
     def _build_filter_chain(
         self,
-        crop_x: int, crop_y: int,
-        crop_w: int, crop_h: int,
+        crop: str,
         player_name: Optional[str],
         event_type: Optional[str],
         score: Optional[str],
-        game_info: Optional[str]
+        game_info: Optional[str],
+        keep_on_gpu: bool = True
     ) -> str:
-        """Build FFmpeg filter chain for crop and overlays."""
+        """
+        Build FFmpeg filter chain for crop and overlays.
+
+        With NVENC the scale runs on the GPU (scale_cuda); frames only come
+        back to system memory if there are text overlays to draw, or if
+        keep_on_gpu is False (e.g. for filters without CUDA support).
+        """
         target_w, target_h = self.config.output_resolution
         filters = []
 
-        # Crop from source
-        filters.append(f"crop={crop_w}:{crop_h}:{crop_x}:{crop_y}")
-
-        # Scale to target resolution
-        filters.append(f"scale={target_w}:{target_h}")
-
         # Add text overlays (sanitize all text to prevent FFmpeg command injection)
         if self.config.show_event_type and event_type:
             event_display = self._sanitize_text(self._format_event_type(event_type))
@@ -298,7 +539,15 @@ class SocialMediaExporter:
         # Add watermark if configured
         # (would need overlay filter with watermark image)
 
-        return ','.join(filters)
+        # Crop from source (see _crop_filter), then scale to target resolution
+        if self.encoder == 'h264_nvenc':
+            scale = [crop, 'format=nv12', 'hwupload_cuda', f"scale_cuda={target_w}:{target_h}"]
+            if filters or not keep_on_gpu:
+                scale += ['hwdownload', 'format=nv12']
+        else:
+            scale = [crop, f"scale={target_w}:{target_h}"]
+
+        return ','.join(scale + filters)
 
     def _format_event_type(self, event_type: str) -> str:
         """Format event type for display."""
@@ -337,53 +586,92 @@ class SocialMediaExporter:
             return {'success': False, 'error': 'No clips provided'}
 
         try:
-            # Export individual clips to temp files
-            temp_files = []
-            with tempfile.TemporaryDirectory() as temp_dir:
-                for i, clip in enumerate(clips):
-                    temp_path = os.path.join(temp_dir, f"clip_{i:03d}.mp4")
-                    result = self.export_clip(
-                        source_video=clip['source_video'],
-                        output_path=temp_path,
-                        start_time=clip['start_time'],
-                        duration=clip.get('duration', 10),
-                        focus_x=clip.get('focus_x', 0.5),
-                        player_name=clip.get('player_name'),
-                        event_type=clip.get('event_type')
+            # One ffmpeg run: every clip is a seeked input, filtered into the
+            # target format and joined with the concat filter, so the reel is
+            # encoded once instead of once per clip plus a concat pass
+            cmd = ['ffmpeg', '-y', '-hide_banner', '-nostats', '-loglevel', 'error']
+            video_chains = []
+            probes = {}
+            total_duration = 0.0
+
+            for clip in clips:
+                source_video = clip['source_video']
+                if source_video not in probes:
+                    try:
+                        probes[source_video] = self._probe_video(source_video)
+                    except Exception as e:
+                        logger.warning(f"Skipping reel clip from {source_video}: {e}")
+                        probes[source_video] = None
+                probe = probes[source_video]
+                if not probe:
+                    continue
+
+                duration = min(clip.get('duration', 10), self.config.max_duration)
+                total_duration += duration
+                cmd += [
+                    *self._seek_args(clip['start_time']),
+                    '-t', str(duration),
+                    '-i', source_video
+                ]
+
+                # concat needs system-memory frames with matching SAR and rate
+                video_chains.append((probe, ','.join([
+                    self._build_filter_chain(
+                        self._crop_filter(clip.get('focus_x', 0.5)),
+                        clip.get('player_name'), clip.get('event_type'), None, None,
+                        keep_on_gpu=False
+                    ),
+                    'setsar=1',
+                    f"fps={self.config.fps}"
+                ])))
+
+            if not video_chains:
+                return {'success': False, 'error': 'No clips exported successfully'}
+
+            # Keep audio only if every clip has some; concat needs it on all inputs
+            with_audio = all(probe['has_audio'] for probe, _ in video_chains)
+
+            graph = []
+            concat_inputs = ''
+            for i, (_, chain) in enumerate(video_chains):
+                graph.append(f"[{i}:v]{chain}[v{i}]")
+                concat_inputs += f"[v{i}]"
+                if with_audio:
+                    graph.append(
+                        f"[{i}:a]aformat=sample_rates=48000:channel_layouts=stereo[a{i}]"
                     )
-                    if result['success']:
-                        temp_files.append(temp_path)
-
-                if not temp_files:
-                    return {'success': False, 'error': 'No clips exported successfully'}
-
-                # Create concat file
-                concat_file = os.path.join(temp_dir, 'concat.txt')
-                with open(concat_file, 'w') as f:
-                    for temp_file in temp_files:
-                        f.write(f"file '{temp_file}'\n")
-
-                # Concat clips
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', concat_file,
-                    '-c', 'copy',
-                    output_path
+                    concat_inputs += f"[a{i}]"
+
+            count = len(video_chains)
+            if with_audio:
+                graph.append(f"{concat_inputs}concat=n={count}:v=1:a=1[outv][outa]")
+                output_args = [
+                    '-map', '[outv]', '-map', '[outa]', '-c:a', 'aac', '-b:a', f'{AUDIO_KBPS}k'
                 ]
+            else:
+                graph.append(f"{concat_inputs}concat=n={count}:v=1:a=0[outv]")
+                output_args = ['-map', '[outv]']
+
+            cmd += [
+                '-filter_complex', ';'.join(graph),
+                *output_args,
+                *self._encoder_args(total_duration),
+                '-movflags', self._movflags(),
+                output_path
+            ]
 
-                result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, stderr = self._run_encode(cmd, total_duration)
 
-                if result.returncode != 0:
-                    return {'success': False, 'error': result.stderr}
+            if returncode != 0:
+                logger.error(f"FFmpeg error: {stderr}")
+                return {'success': False, 'error': stderr}
 
-            output_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            output_size = _file_size(output_path)
 
             return {
                 'success': True,
                 'output_path': output_path,
-                'clip_count': len(temp_files),
+                'clip_count': count,
                 'file_size_mb': round(output_size / (1024 * 1024), 2)
             }
 
@@ -398,10 +686,81 @@ class SocialMediaExporter:
 
 def register_social_routes(app, db):
     """Register social media export routes."""
-    from flask import jsonify, request, send_file, render_template_string, session
-    from ..auth import login_required
+    from flask import jsonify, request, render_template_string, send_file, session
+    from ..auth import get_user_team_ids, login_required, minify_html
+    from ..cache import ResponseCache, social_job_key
 
     exporter = SocialMediaExporter()
+    cache = app.config.get('cache') or ResponseCache()
+
+    # The export page is identical for every visitor: render, minify, encode
+    # and gzip it on the first request of each worker (the stylesheet URL
+    # needs an app context), then serve those bytes
+    page: Dict[str, bytes] = {}
+
+    def _export_page() -> Dict[str, bytes]:
+        if not page:
+            html = render_template_string(SOCIAL_EXPORT_HTML)
+            body = (html if app.debug else minify_html(html)).encode('utf-8')
+            page.update(
+                body=body,
+                gzip=gzip.compress(body, compresslevel=9, mtime=0),
+                etag=hashlib.sha1(body).hexdigest()
+            )
+        return page
+
+    def _run_export(export, output_path: str, **kwargs) -> Dict:
+        """
+        Run an exporter method into a partial file, then move it into place.
+
+        output_path only ever holds a finished export, so a failed or
+        interrupted encode is never served (or reused) as a result.
+        """
+        partial_path = f"{os.path.splitext(output_path)[0]}.{uuid.uuid4().hex}.partial.mp4"
+        try:
+            result = export(output_path=partial_path, **kwargs)
+            if result['success']:
+                os.replace(partial_path, output_path)
+        except Exception as e:
+            logger.error(f"Social export to {output_path} failed: {e}")
+            result = {'success': False, 'error': str(e)}
+
+        if result['success']:
+            result['output_path'] = output_path
+            result['download_url'] = f"/api/social/download/{os.path.basename(output_path)}"
+        elif os.path.exists(partial_path):
+            os.remove(partial_path)
+        return result
+
+    def _start_export(export, output_path: str, output_seconds: float, **kwargs):
+        """
+        Start an export; returns the response for the export route.
+
+        With Redis the encode runs on the background pool and the client
+        polls /api/social/job/<id>, 202 first. Job state has to be visible
+        to every gunicorn worker a poll can land on, so without the shared
+        cache the export runs synchronously within the request instead.
+        output_seconds (length of the result) sizes the job's timeout.
+        """
+        if not cache.enabled:
+            return jsonify(_run_export(export, output_path, **kwargs))
+
+        job_id = uuid.uuid4().hex
+        user_id = session['user_id']
+        key = social_job_key(job_id)
+        timeout = int(SOCIAL_JOB_TIMEOUT_BASE + SOCIAL_JOB_TIMEOUT_PER_SECOND * output_seconds)
+        job = {'user_id': user_id, 'timeout_at': time.time() + timeout}
+        cache.set(key, dict(job, status='queued'), timeout=SOCIAL_JOB_TTL)
+
+        def run():
+            cache.set(key, dict(job, status='running'), timeout=SOCIAL_JOB_TTL)
+            result = _run_export(export, output_path, **kwargs)
+            result['status'] = 'completed' if result['success'] else 'failed'
+            result['user_id'] = user_id
+            cache.set(key, result, timeout=SOCIAL_JOB_TTL)
+
+        _export_pool.submit(run)
+        return jsonify({'job_id': job_id, 'status': 'queued', 'timeout_seconds': timeout}), 202
 
     @app.route('/api/social/export', methods=['POST'])
     @login_required
@@ -452,30 +811,89 @@ def register_social_routes(app, db):
         game_info = f"vs {game.opponent}" if game.opponent else None
         score = f"{game.home_score}-{game.away_score}" if game.home_score is not None else None
 
-        # Generate output path
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = f"social_{clip_id or event_id}_{timestamp}.mp4"
+        export_args = {
+            'source_video': source_video,
+            'start_time': start_time,
+            'duration': min(duration, data.get('max_duration', 60)),
+            'focus_x': focus_x,
+            'player_name': player_name,
+            'event_type': event_type,
+            'score': score if data.get('show_score') else None,
+            'game_info': game_info
+        }
+
+        # Name the output after everything that determines its content, so a
+        # retried request (flaky mobile connections) reuses the finished file
+        output_filename = f"social_{exporter.export_key(**export_args)}.mp4"
         output_dir = os.path.join(app.config.get('UPLOAD_FOLDER', '/tmp'), 'social')
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, output_filename)
 
+        output_size = _file_size(output_path)
+        if output_size:
+            return jsonify({
+                'success': True,
+                'status': 'completed',
+                'download_url': f"/api/social/download/{output_filename}",
+                'file_size': output_size,
+                'file_size_mb': round(output_size / (1024 * 1024), 2)
+            })
+
         # Export
-        result = exporter.export_clip(
-            source_video=source_video,
-            output_path=output_path,
-            start_time=start_time,
-            duration=min(duration, data.get('max_duration', 60)),
-            focus_x=focus_x,
-            player_name=player_name,
-            event_type=event_type,
-            score=score if data.get('show_score') else None,
-            game_info=game_info
+        return _start_export(
+            exporter.export_clip, output_path, export_args['duration'], **export_args
         )
 
-        if result['success']:
-            result['download_url'] = f"/api/social/download/{output_filename}"
+    @app.route('/api/social/job/<job_id>')
+    @login_required
+    def api_social_job(job_id: str):
+        """Poll a background export started by /api/social/export or highlight-reel."""
+        job = cache.get(social_job_key(job_id))
+        if not job or job.get('user_id') != session['user_id']:
+            return jsonify({'error': 'Job not found'}), 404
+
+        if job['status'] in ('queued', 'running') and time.time() > job.get('timeout_at', 0):
+            # Lost to a worker restart; a late finish still overwrites this
+            return jsonify({'status': 'failed', 'success': False, 'error': 'timed out'})
+
+        return jsonify({k: v for k, v in job.items() if k not in ('user_id', 'timeout_at')})
+
+    @app.route('/api/social/clips')
+    @login_required
+    def api_social_clips():
+        """
+        Clips the user can export, newest first, for the export page list.
 
-        return jsonify(result)
+        One query returns everything a list row shows, thumbnail URL
+        included, so the page needs no per-clip follow-up requests.
+        """
+        from ..models import Clip, Game, GameEvent
+
+        limit = min(request.args.get('limit', 50, type=int), 200)
+        team_ids = get_user_team_ids(db, session['user_id'])
+        if not team_ids:
+            return jsonify({'clips': []})
+
+        rows = (
+            db.query(
+                Clip.id, Clip.title, Clip.duration_seconds,
+                Clip.thumbnail_url, GameEvent.event_type
+            )
+            .join(Game, Clip.game_id == Game.id)
+            .outerjoin(GameEvent, Clip.event_id == GameEvent.id)
+            .filter(Game.team_id.in_(team_ids))
+            .order_by(Clip.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+        return jsonify({'clips': [{
+            'id': row.id,
+            'title': row.title,
+            'event_type': row.event_type.value if row.event_type else None,
+            'duration': round(row.duration_seconds) if row.duration_seconds else None,
+            'thumb_url': row.thumbnail_url
+        } for row in rows]})
 
     @app.route('/api/social/download/<filename>')
     @login_required
@@ -495,7 +913,15 @@ def register_social_routes(app, db):
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
 
-        return send_file(file_path, as_attachment=True)
+        # An export file never changes under its name (clips are named by
+        # content hash, reels by timestamp), so the bytes the preview player
+        # fetched can be reused by the Download link for as long as the job
+        # that produced it is kept. Range requests are answered, so the
+        # preview only pulls what it plays
+        response = send_file(file_path, as_attachment=True, max_age=SOCIAL_JOB_TTL)
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
 
     @app.route('/api/social/highlight-reel', methods=['POST'])
     @login_required
@@ -548,21 +974,30 @@ def register_social_routes(app, db):
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, output_filename)
 
-        result = exporter.export_highlight_reel(
+        return _start_export(
+            exporter.export_highlight_reel,
+            output_path,
+            sum(clip['duration'] for clip in clips_data),
             clips=clips_data,
-            output_path=output_path,
             title=data.get('title')
         )
 
-        if result['success']:
-            result['download_url'] = f"/api/social/download/{output_filename}"
-
-        return jsonify(result)
-
     @app.route('/social-export')
     def social_export_page():
         """Social media export UI."""
-        return render_template_string(SOCIAL_EXPORT_HTML)
+        page = _export_page()
+
+        # Each encoding is a different representation, so it gets its own ETag
+        if 'gzip' in request.accept_encodings:
+            response = app.make_response(page['gzip'])
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(f"{page['etag']}-gz")
+        else:
+            response = app.make_response(page['body'])
+            response.set_etag(page['etag'])
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+        return response.make_conditional(request)
 
 
 # =============================================================================
@@ -576,46 +1011,7 @@ SOCIAL_EXPORT_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Social Media Export - Soccer Rig</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #0f172a; color: #f1f5f9; min-height: 100vh; }
-        .header { background: linear-gradient(135deg, #7c3aed 0%, #4f46e5 100%); padding: 1.5rem 2rem; }
-        .header-content { max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 2rem; }
-        .grid { display: grid; grid-template-columns: 1fr 300px; gap: 2rem; }
-        @media (max-width: 768px) { .grid { grid-template-columns: 1fr; } }
-        .card { background: #1e293b; border-radius: 1rem; padding: 1.5rem; margin-bottom: 1.5rem; }
-        .card h2 { font-size: 1.25rem; margin-bottom: 1rem; color: #a5b4fc; }
-        .preview-container { aspect-ratio: 9/16; max-height: 500px; background: #0f172a; border-radius: 0.5rem; display: flex; align-items: center; justify-content: center; margin-bottom: 1rem; overflow: hidden; }
-        .preview-placeholder { color: #64748b; text-align: center; }
-        .preview-placeholder .icon { font-size: 4rem; margin-bottom: 1rem; }
-        video { max-width: 100%; max-height: 100%; }
-        .platform-buttons { display: flex; gap: 0.5rem; flex-wrap: wrap; margin-bottom: 1rem; }
-        .platform-btn { padding: 0.5rem 1rem; border-radius: 2rem; border: 2px solid #334155; background: transparent; color: #f1f5f9; cursor: pointer; font-size: 0.875rem; }
-        .platform-btn.active { background: #4f46e5; border-color: #4f46e5; }
-        .form-group { margin-bottom: 1rem; }
-        .form-group label { display: block; margin-bottom: 0.5rem; color: #94a3b8; font-size: 0.875rem; }
-        .form-group input, .form-group select { width: 100%; padding: 0.75rem; border: 2px solid #334155; border-radius: 0.5rem; background: #0f172a; color: #f1f5f9; }
-        .form-group input:focus, .form-group select:focus { outline: none; border-color: #4f46e5; }
-        .checkbox-group { display: flex; align-items: center; gap: 0.5rem; }
-        .checkbox-group input { width: auto; }
-        .btn { padding: 0.75rem 1.5rem; border-radius: 0.5rem; border: none; cursor: pointer; font-weight: 600; }
-        .btn-primary { background: linear-gradient(135deg, #7c3aed, #4f46e5); color: white; width: 100%; }
-        .btn-primary:hover { opacity: 0.9; }
-        .btn-secondary { background: #334155; color: #f1f5f9; }
-        .clip-list { max-height: 300px; overflow-y: auto; }
-        .clip-item { display: flex; align-items: center; gap: 0.75rem; padding: 0.75rem; background: #0f172a; border-radius: 0.5rem; margin-bottom: 0.5rem; cursor: pointer; }
-        .clip-item:hover { background: #1e293b; }
-        .clip-item.selected { border: 2px solid #4f46e5; }
-        .clip-thumb { width: 60px; height: 40px; background: #334155; border-radius: 0.25rem; }
-        .clip-info { flex: 1; }
-        .clip-title { font-size: 0.875rem; font-weight: 500; }
-        .clip-meta { font-size: 0.75rem; color: #64748b; }
-        .status { padding: 1rem; border-radius: 0.5rem; margin-top: 1rem; }
-        .status.success { background: #064e3b; color: #6ee7b7; }
-        .status.error { background: #7f1d1d; color: #fca5a5; }
-        .status.processing { background: #1e3a5f; color: #93c5fd; }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('css/social_export.css') }}">
 </head>
 <body>
     <div class="header">
@@ -630,10 +1026,10 @@ SOCIAL_EXPORT_HTML = """
                 <div class="card">
                     <h2>Select Platform</h2>
                     <div class="platform-buttons">
-                        <button class="platform-btn active" data-ratio="9:16" onclick="selectPlatform(this)">TikTok</button>
-                        <button class="platform-btn" data-ratio="9:16" onclick="selectPlatform(this)">Instagram Reels</button>
-                        <button class="platform-btn" data-ratio="9:16" onclick="selectPlatform(this)">YouTube Shorts</button>
-                        <button class="platform-btn" data-ratio="1:1" onclick="selectPlatform(this)">Instagram Square</button>
+                        <button class="platform-btn active" data-ratio="9:16">TikTok</button>
+                        <button class="platform-btn" data-ratio="9:16">Instagram Reels</button>
+                        <button class="platform-btn" data-ratio="9:16">YouTube Shorts</button>
+                        <button class="platform-btn" data-ratio="1:1">Instagram Square</button>
                     </div>
                 </div>
 
@@ -642,6 +1038,15 @@ SOCIAL_EXPORT_HTML = """
                     <div class="clip-list" id="clip-list">
                         <p style="color: #64748b; text-align: center; padding: 2rem;">Loading clips...</p>
                     </div>
+                    <template id="clip-template">
+                        <div class="clip-item">
+                            <div class="clip-thumb"><img loading="lazy" alt=""></div>
+                            <div class="clip-info">
+                                <div class="clip-title"></div>
+                                <div class="clip-meta"></div>
+                            </div>
+                        </div>
+                    </template>
                 </div>
 
                 <div class="card">
@@ -685,9 +1090,14 @@ SOCIAL_EXPORT_HTML = """
     </div>
 
     <script>
-        let selectedClipIds = [];
+        const selectedClipIds = new Set();
         let selectedPlatform = 'tiktok';
 
+        const maxDurationInput = document.getElementById('max-duration');
+        const showScoreInput = document.getElementById('show-score');
+        const previewEl = document.getElementById('preview');
+        const statusEl = document.getElementById('status');
+
         function selectPlatform(btn) {
             document.querySelectorAll('.platform-btn').forEach(b => b.classList.remove('active'));
             btn.classList.add('active');
@@ -696,8 +1106,8 @@ SOCIAL_EXPORT_HTML = """
 
         async function loadClips() {
             try {
-                // This would fetch from your clips API
-                const response = await fetch('/api/clips?limit=50');
+                // Everything a row shows, thumbnails included, in one request
+                const response = await fetch('/api/social/clips?limit=50');
                 const data = await response.json();
 
                 const list = document.getElementById('clip-list');
@@ -706,15 +1116,26 @@ SOCIAL_EXPORT_HTML = """
                     return;
                 }
 
-                list.innerHTML = data.clips.map(clip => `
-                    <div class="clip-item" data-id="${clip.id}" onclick="toggleClip(this, ${clip.id})">
-                        <div class="clip-thumb"></div>
-                        <div class="clip-info">
-                            <div class="clip-title">${clip.title || 'Untitled'}</div>
-                            <div class="clip-meta">${clip.event_type || ''} - ${clip.duration || 0}s</div>
-                        </div>
-                    </div>
-                `).join('');
+                // Clone the parsed row template and insert every row at once,
+                // so the list is laid out a single time
+                const template = document.getElementById('clip-template');
+                const fragment = document.createDocumentFragment();
+                for (const clip of data.clips) {
+                    const row = template.content.cloneNode(true);
+                    const item = row.querySelector('.clip-item');
+                    item.dataset.id = clip.id;
+
+                    const thumb = row.querySelector('.clip-thumb img');
+                    if (clip.thumb_url) {
+                        thumb.src = clip.thumb_url;
+                    } else {
+                        thumb.remove();
+                    }
+                    row.querySelector('.clip-title').textContent = clip.title || 'Untitled';
+                    row.querySelector('.clip-meta').textContent = `${clip.event_type || ''} - ${clip.duration || 0}s`;
+                    fragment.appendChild(row);
+                }
+                list.replaceChildren(fragment);
             } catch (error) {
                 document.getElementById('clip-list').innerHTML =
                     '<p style="color: #64748b; text-align: center; padding: 2rem;">No clips available yet. Record a game first!</p>';
@@ -722,34 +1143,37 @@ SOCIAL_EXPORT_HTML = """
         }
 
         function toggleClip(element, clipId) {
-            element.classList.toggle('selected');
-            if (element.classList.contains('selected')) {
-                selectedClipIds.push(clipId);
+            if (element.classList.toggle('selected')) {
+                selectedClipIds.add(clipId);
             } else {
-                selectedClipIds = selectedClipIds.filter(id => id !== clipId);
+                selectedClipIds.delete(clipId);
             }
         }
 
         async function exportClip() {
-            if (selectedClipIds.length === 0) {
+            if (selectedClipIds.size === 0) {
                 showStatus('Please select at least one clip', 'error');
                 return;
             }
 
+            // Read the form before touching the status line
+            const maxDuration = maxDurationInput.valueAsNumber;
+            const showScore = showScoreInput.checked;
+
             showStatus('Processing...', 'processing');
 
             try {
                 let result;
 
-                if (selectedClipIds.length === 1) {
+                if (selectedClipIds.size === 1) {
                     // Single clip export
                     const response = await fetch('/api/social/export', {
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({
-                            clip_id: selectedClipIds[0],
-                            max_duration: parseInt(document.getElementById('max-duration').value),
-                            show_score: document.getElementById('show-score').checked
+                            clip_id: [...selectedClipIds][0],
+                            max_duration: maxDuration,
+                            show_score: showScore
                         })
                     });
                     result = await response.json();
@@ -759,18 +1183,30 @@ SOCIAL_EXPORT_HTML = """
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({
-                            clip_ids: selectedClipIds
+                            clip_ids: [...selectedClipIds]
                         })
                     });
                     result = await response.json();
                 }
 
+                if (result.job_id) {
+                    result = await waitForJob(result.job_id, result.timeout_seconds);
+                }
+
                 if (result.success) {
-                    showStatus(`Export complete! <a href="${result.download_url}" style="color: inherit; font-weight: bold;">Download (${result.file_size_mb} MB)</a>`, 'success');
+                    showStatus('Export complete!', 'success', {
+                        href: result.download_url,
+                        text: `Download (${result.file_size_mb} MB)`
+                    });
 
                     // Show video preview
-                    document.getElementById('preview').innerHTML =
-                        `<video controls src="${result.download_url}"></video>`;
+                    // Only metadata until the user hits play; the file is
+                    // fetched in ranges as it plays
+                    const video = document.createElement('video');
+                    video.controls = true;
+                    video.preload = 'metadata';
+                    video.src = result.download_url;
+                    previewEl.replaceChildren(video);
                 } else {
                     showStatus('Export failed: ' + result.error, 'error');
                 }
@@ -779,12 +1215,50 @@ SOCIAL_EXPORT_HTML = """
             }
         }
 
-        function showStatus(message, type) {
-            const status = document.getElementById('status');
-            status.innerHTML = message;
-            status.className = 'status ' + type;
+        async function waitForJob(jobId, timeoutSeconds) {
+            // Exports are encoded in the background; poll until the job ends.
+            // The server fails jobs past their timeout; the slack here only
+            // covers polls that never get that answer
+            const deadline = Date.now() + ((timeoutSeconds || 300) + 30) * 1000;
+            while (Date.now() < deadline) {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                const response = await fetch(`/api/social/job/${jobId}`);
+                const job = await response.json();
+                if (!response.ok || job.status === 'completed' || job.status === 'failed') {
+                    return job;
+                }
+            }
+            return { success: false, error: 'timed out waiting for the export' };
+        }
+
+        function showStatus(message, type, link) {
+            // Messages can carry server text (ffmpeg errors), so never parse them as HTML
+            statusEl.textContent = message;
+            if (link) {
+                const a = document.createElement('a');
+                a.href = link.href;
+                a.textContent = link.text;
+                a.style.cssText = 'color: inherit; font-weight: bold;';
+                statusEl.append(' ', a);
+            }
+            statusEl.className = 'status ' + type;
         }
 
+        document.querySelector('.platform-buttons').addEventListener('click', e => {
+            const btn = e.target.closest('.platform-btn');
+            if (btn) {
+                selectPlatform(btn);
+            }
+        });
+
+        // One listener for every clip row, however often the list is rebuilt
+        document.getElementById('clip-list').addEventListener('click', e => {
+            const item = e.target.closest('.clip-item');
+            if (item) {
+                toggleClip(item, Number(item.dataset.id));
+            }
+        });
+
         // Load clips on page load
         loadClips();
     </script>
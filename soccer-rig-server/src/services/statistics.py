@@ -11,7 +11,7 @@ Aggregates player statistics from game events:
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 from dataclasses import dataclass
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_, desc, tuple_
 from sqlalchemy.orm import Session
 import logging
 
@@ -360,12 +360,36 @@ class StatisticsService:
             return None
 
         s, p = stats
+        return self._season_stats_dict(s, p)
+
+    def get_player_stats_for_teams(self, player_id: int,
+                                   team_seasons: List[Tuple[int, str]]) -> Dict[int, Dict]:
+        """
+        Get a player's season statistics for several (team_id, season) pairs
+        in one query. Returns {team_id: stats dict} for pairs that have stats.
+        """
+        from ..models import PlayerSeasonStats, Player
+
+        if not team_seasons:
+            return {}
+
+        rows = self.db.query(PlayerSeasonStats, Player).join(
+            Player, PlayerSeasonStats.player_id == Player.id
+        ).filter(
+            PlayerSeasonStats.player_id == player_id,
+            tuple_(PlayerSeasonStats.team_id, PlayerSeasonStats.season).in_(team_seasons)
+        ).all()
+
+        return {s.team_id: self._season_stats_dict(s, p) for s, p in rows}
+
+    def _season_stats_dict(self, s, p) -> Dict:
+        """Serialize a PlayerSeasonStats row and its Player."""
         return {
             'player_id': p.id,
             'player_name': p.full_name,
             'birth_year': p.birth_year,
-            'team_id': team_id,
-            'season': season,
+            'team_id': s.team_id,
+            'season': s.season,
             'games_played': s.games_played,
             'minutes_played': s.minutes_played,
             'goals': s.goals,
@@ -0,0 +1,116 @@
+"""
+Shared fixtures for the soccer-rig-server tests.
+
+Each test gets a fresh app on its own SQLite database and upload folder.
+Redis is replaced by an in-memory stand-in only where a test asks for it.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeRedis:
+    """The subset of redis.Redis that ResponseCache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode('utf-8') if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv('UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setenv('JINJA_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('REDIS_URL', raising=False)
+
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
+    app.config['db'].remove()
+
+
+@pytest.fixture
+def db(app):
+    return app.config['db']
+
+
+@pytest.fixture
+def redis(app):
+    """Enable the app's response cache on an in-memory Redis."""
+    fake = FakeRedis()
+    app.config['cache']._redis = fake
+    return fake
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def seed(db, tmp_path):
+    """
+    Two parents, one with two children on a team with a recorded game.
+
+    Returns a dict of ids (the ORM objects are expired by later commits).
+    """
+    from src.models import Clip, EventType, Game, GameEvent, Player, Team, User, UserRole
+
+    parent = User(email='parent@example.com', first_name='Pat', last_name='Parent',
+                  role=UserRole.PARENT)
+    parent.set_password('secret1')
+    other = User(email='other@example.com', first_name='Oli', last_name='Other',
+                 role=UserRole.PARENT)
+    other.set_password('secret2')
+
+    team = Team(name='Blue', season='Fall 2024')
+    kid = Player(first_name='Kid', last_name='One', birth_year=2012)
+    sibling = Player(first_name='Kid', last_name='Two', birth_year=2014)
+    kid.teams.append(team)
+    sibling.teams.append(team)
+    parent.children.extend([kid, sibling])
+    db.add_all([parent, other, team, kid, sibling])
+    db.commit()
+
+    panorama = tmp_path / 'panorama.mp4'
+    panorama.write_bytes(b'video')
+    game = Game(team_id=team.id, opponent='Reds', game_date=datetime(2024, 9, 1),
+                panorama_url=str(panorama), home_score=2, away_score=1)
+    db.add(game)
+    db.commit()
+
+    event = GameEvent(game_id=game.id, player_id=kid.id, event_type=EventType.GOAL,
+                      timestamp_seconds=120, field_position_x=0.25, field_position_y=0.5)
+    db.add(event)
+    db.commit()
+
+    clip = Clip(game_id=game.id, event_id=event.id, title='Goal', file_path='clip.mp4',
+                start_time=115, duration_seconds=12)
+    db.add(clip)
+    db.commit()
+
+    return {
+        'parent_id': parent.id, 'other_id': other.id, 'team_id': team.id,
+        'kid_id': kid.id, 'sibling_id': sibling.id, 'game_id': game.id,
+        'event_id': event.id, 'clip_id': clip.id,
+    }
+
+
+def login(client, email='parent@example.com', password='secret1'):
+    return client.post('/login', data={'email': email, 'password': password})
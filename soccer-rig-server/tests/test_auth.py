@@ -0,0 +1,136 @@
+"""Tests for the auth pages and account routes."""
+
+from conftest import login
+
+
+# =============================================================================
+# Static pages
+# =============================================================================
+
+def test_settings_shell_revalidates_with_etag(client, seed):
+    login(client)
+    response = client.get('/settings')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, max-age=0, must-revalidate'
+
+    etag = response.headers['ETag']
+    response = client.get('/settings', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+# =============================================================================
+# Password hashing
+# =============================================================================
+
+def _set_legacy_hash(db, user_id, password):
+    from werkzeug.security import generate_password_hash
+    from src.models import User
+
+    user = db.get(User, user_id)
+    user.password_hash = generate_password_hash(password)
+    db.commit()
+    return user.password_hash
+
+
+def _password_hash(db, user_id):
+    from src.models import User
+
+    db.expire_all()
+    return db.get(User, user_id).password_hash
+
+
+def test_argon2_hash_round_trips():
+    from src.models import User
+
+    user = User()
+    user.set_password('correct horse')
+
+    assert user.password_hash.startswith('$argon2')
+    assert user.check_password('correct horse')
+    assert not user.check_password('wrong horse')
+    assert not user.password_needs_rehash
+
+
+def test_legacy_hash_is_upgraded_on_successful_login(client, db, seed):
+    legacy = _set_legacy_hash(db, seed['parent_id'], 'secret1')
+
+    response = login(client)
+    assert response.status_code == 302
+
+    upgraded = _password_hash(db, seed['parent_id'])
+    assert upgraded != legacy
+    assert upgraded.startswith('$argon2')
+
+    # The upgraded hash still logs the user in
+    client.get('/logout')
+    assert login(client).status_code == 302
+
+
+def test_wrong_password_does_not_rewrite_legacy_hash(client, db, seed):
+    legacy = _set_legacy_hash(db, seed['parent_id'], 'secret1')
+
+    response = login(client, password='not-the-password')
+    assert response.status_code == 200
+    assert b'Invalid email or password' in response.data
+
+    assert _password_hash(db, seed['parent_id']) == legacy
+
+
+# =============================================================================
+# Registration
+# =============================================================================
+
+def _register(client, email):
+    return client.post('/register', data={
+        'email': email, 'password': 'secret9', 'confirm_password': 'secret9',
+        'first_name': 'New', 'last_name': 'User', 'user_type': 'parent',
+    })
+
+
+def test_duplicate_email_rerenders_register_form(client, db, seed):
+    from src.models import User
+
+    users = db.query(User).count()
+    response = _register(client, ' Parent@Example.com ')
+
+    assert response.status_code == 200
+    assert b'Email already registered' in response.data
+    assert db.query(User).count() == users
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
+
+    # The rolled-back session keeps serving requests
+    response = _register(client, 'new@example.com')
+    assert response.status_code == 302
+    assert db.query(User).count() == users + 1
+    assert login(client, 'parent@example.com', 'secret1').status_code == 302
+
+
+# =============================================================================
+# Dashboard
+# =============================================================================
+
+def test_recent_clips_skip_clips_without_a_game(db, seed):
+    from datetime import datetime
+    from src.auth import _get_players_data
+    from src.models import Clip, Player
+
+    def add_clips(game_id, minutes):
+        db.add_all([
+            Clip(game_id=game_id, event_id=seed['event_id'], title=f'Clip {minute}',
+                 file_path='clip.mp4', created_at=datetime(2100, 1, 1, 0, minute))
+            for minute in minutes
+        ])
+
+    # Older clips of a real game, then newer ones whose game no longer exists
+    add_clips(seed['game_id'], range(10, 16))
+    add_clips(seed['game_id'] + 100, range(20, 25))
+    db.commit()
+
+    kid = db.get(Player, seed['kid_id'])
+    [data] = _get_players_data(db, [kid])
+
+    assert data['clip_count'] == 5
+    assert [clip['title'] for clip in data['recent_clips']] == [
+        f'Clip {minute}' for minute in range(15, 10, -1)
+    ]
@@ -0,0 +1,135 @@
+"""
+Snapshot tests for the ffmpeg command lines built by SocialMediaExporter.
+
+ffmpeg and a GPU are not needed: the exporter's subprocess calls are
+replaced and the argv it would run is compared with tests/snapshots/.
+After an intended change, regenerate with UPDATE_SNAPSHOTS=1 and review
+the diff.
+"""
+
+import os
+import re
+import shlex
+
+import pytest
+
+from src.services.social_export import SocialClipConfig, SocialMediaExporter
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'snapshots', 'ffmpeg')
+
+PROBE = {
+    'width': 7680, 'height': 2160, 'has_audio': True, 'audio_codec': 'aac',
+    'duration': 5400.0, 'fps': 30.0,
+}
+
+
+@pytest.fixture
+def run_exporter(tmp_path, monkeypatch):
+    """Build an exporter whose ffmpeg runs are recorded instead of executed."""
+    source = tmp_path / 'panorama.mp4'
+    source.write_bytes(b'video')
+
+    def build(encoder, target_file_mb=None):
+        monkeypatch.setattr(SocialMediaExporter, '_encoder', encoder)
+        exporter = SocialMediaExporter(SocialClipConfig(target_file_mb=target_file_mb))
+        commands = []
+
+        def fake_ffmpeg(cmd):
+            commands.append(cmd)
+            return 0, ''
+
+        monkeypatch.setattr(exporter, '_run_ffmpeg', fake_ffmpeg)
+        monkeypatch.setattr(exporter, '_run_ffprobe', lambda path: dict(PROBE))
+        return exporter, str(source), commands
+
+    return build
+
+
+def _export_clip(exporter, source):
+    return exporter.export_clip(
+        source_video=source, output_path='/out/clip.mp4', start_time=115.5,
+        duration=12, focus_x=0.25, player_name="Kid O'Neil", event_type='goal',
+        score='2-1', game_info='vs Reds'
+    )
+
+
+def _export_reel(exporter, source):
+    return exporter.export_highlight_reel(
+        clips=[
+            {'source_video': source, 'start_time': 60, 'duration': 8, 'focus_x': 0.1,
+             'player_name': 'Kid One', 'event_type': 'save'},
+            {'source_video': source, 'start_time': 300, 'duration': 12, 'focus_x': 0.9},
+        ],
+        output_path='/out/reel.mp4'
+    )
+
+
+def _normalize(commands, source):
+    """One shell-quoted command per line, with machine-specific paths replaced."""
+    lines = []
+    for cmd in commands:
+        line = shlex.join(cmd).replace(source, '/src/panorama.mp4')
+        lines.append(re.sub(r'\S+/ffmpeg2pass\b', '/tmp/passlog/ffmpeg2pass', line))
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.mark.parametrize('encoder', ['h264_nvenc', 'libx264'])
+@pytest.mark.parametrize('kind, export', [('clip', _export_clip), ('reel', _export_reel)])
+@pytest.mark.parametrize('target_file_mb', [None, 20], ids=['quality', 'size-target'])
+def test_command_lines_match_snapshot(run_exporter, encoder, kind, export, target_file_mb):
+    exporter, source, commands = run_exporter(encoder, target_file_mb)
+    assert export(exporter, source)['success'], 'export failed before running ffmpeg'
+
+    actual = _normalize(commands, source)
+    rate = 'size' if target_file_mb else 'quality'
+    path = os.path.join(SNAPSHOT_DIR, f'{kind}-{encoder}-{rate}.txt')
+
+    if os.environ.get('UPDATE_SNAPSHOTS'):
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(actual)
+
+    with open(path) as f:
+        assert actual == f.read()
+
+
+@pytest.mark.parametrize('encoder, passes', [('h264_nvenc', 1), ('libx264', 2)])
+def test_size_target_passes(run_exporter, encoder, passes):
+    exporter, source, commands = run_exporter(encoder, target_file_mb=20)
+    _export_clip(exporter, source)
+
+    assert len(commands) == passes
+    assert commands[-1][-1] == '/out/clip.mp4'
+    if passes == 2:
+        assert commands[0][-3:] == ['-f', 'null', os.devnull]
+        assert ['-pass', '1'] == commands[0][commands[0].index('-pass'):][:2]
+        assert ['-pass', '2'] == commands[1][commands[1].index('-pass'):][:2]
+
+
+def test_nvenc_chain_uploads_before_gpu_scale_and_downloads_before_text(run_exporter):
+    exporter, source, commands = run_exporter('h264_nvenc')
+    _export_clip(exporter, source)
+
+    cmd = commands[0]
+    filters = cmd[cmd.index('-vf') + 1]
+    # Split on the commas between filters, not the ones inside expressions
+    names = [f.split('=')[0] for f in re.split(r",(?=[a-z_]+(?:=|,|$))", filters)]
+
+    assert names[:6] == ['crop', 'format', 'hwupload_cuda', 'scale_cuda', 'hwdownload', 'format']
+    assert set(names[6:]) == {'drawtext'}
+    assert cmd[cmd.index('-hwaccel') + 1] == 'cuda'
+    assert cmd.index('-hwaccel') < cmd.index('-i')
+
+
+def test_reel_graph_consumes_every_input(run_exporter):
+    exporter, source, commands = run_exporter('libx264')
+    _export_reel(exporter, source)
+
+    cmd = commands[0]
+    graph = cmd[cmd.index('-filter_complex') + 1]
+    inputs = cmd.count('-i')
+
+    assert inputs == 2
+    for i in range(inputs):
+        assert f'[{i}:v]' in graph and f'[{i}:a]' in graph
+    assert f'concat=n={inputs}:v=1:a=1[outv][outa]' in graph
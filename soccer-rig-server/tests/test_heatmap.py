@@ -0,0 +1,190 @@
+"""Tests for heat map generation and the heat map routes."""
+
+import base64
+import math
+import random
+
+import numpy as np
+import pytest
+
+from conftest import login
+from src.services.heatmap import HeatMapData, HeatMapService, PositionPoint
+
+
+def reference_grid(points, width=HeatMapService.GRID_WIDTH,
+                   height=HeatMapService.GRID_HEIGHT, radius=HeatMapService.BLUR_RADIUS):
+    """The original per-point gaussian stamp the vectorized grid must match."""
+    grid = [[0.0] * width for _ in range(height)]
+    for point in points:
+        gx = max(0, min(width - 1, int(point.x * (width - 1))))
+        gy = max(0, min(height - 1, int(point.y * (height - 1))))
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                nx, ny = gx + dx, gy + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    falloff = math.exp(-(dx * dx + dy * dy) / (2 * radius))
+                    grid[ny][nx] += point.weight * falloff
+    return np.array(grid)
+
+
+def fixed_points(count, seed=7):
+    """Weighted points spread over (and slightly past) the field, plus both corners."""
+    rng = random.Random(seed)
+    points = [
+        PositionPoint(x=rng.uniform(-0.1, 1.1), y=rng.uniform(-0.1, 1.1), timestamp=0,
+                      weight=rng.choice([0.5, 1.0, 1.5, 2.0, 3.0]))
+        for _ in range(count)
+    ]
+    return points + [PositionPoint(x=0.0, y=0.0, timestamp=0),
+                     PositionPoint(x=1.0, y=1.0, timestamp=0)]
+
+
+# =============================================================================
+# Grid generation
+# =============================================================================
+
+@pytest.mark.parametrize('points', [
+    [],
+    [PositionPoint(x=0.5, y=0.5, timestamp=0, weight=3.0)],
+    [PositionPoint(x=0.0, y=1.0, timestamp=0)],
+    fixed_points(500),
+], ids=['empty', 'single', 'corner', 'many'])
+def test_grid_matches_reference(points):
+    grid = HeatMapService(None)._generate_grid(points)
+
+    assert grid.shape == (HeatMapService.GRID_HEIGHT, HeatMapService.GRID_WIDTH)
+    np.testing.assert_allclose(grid, reference_grid(points), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize('points', [[], fixed_points(500)], ids=['empty', 'many'])
+def test_canvas_grid_is_normalized_reference(points):
+    service = HeatMapService(None)
+    grid = service._generate_grid(points)
+    heatmap = HeatMapData(player_id=1, player_name='Kid', points=points,
+                          grid=grid, max_intensity=float(grid.max()))
+
+    data = service.to_canvas_data(heatmap)
+    quantized = np.frombuffer(base64.b64decode(data['gridB64']), dtype=np.uint8)
+
+    expected = reference_grid(points)
+    if expected.max():
+        expected = expected / expected.max()
+    expected = np.rint(expected * 255).ravel()
+    # float32 rounding may move a cell that sits on a .5 boundary by one step
+    assert np.abs(quantized.astype(int) - expected).max() <= 1
+    assert quantized.max() == (255 if points else 0)
+
+
+@pytest.mark.parametrize('sql_floor', [True, False], ids=['floor', 'cast'])
+def test_sql_grid_matches_python_grid(db, seed, monkeypatch, sql_floor):
+    from src.models import EventType, GameEvent
+
+    rng = random.Random(3)
+    positions = [(0.0, 0.0), (1.0, 1.0), (1.0, 0.0), (0.0, 1.0), (0.5, 0.5)]
+    positions += [(rng.uniform(0, 1), rng.uniform(0, 1)) for _ in range(200)]
+    event_types = list(EventType)
+    db.add_all([
+        GameEvent(game_id=seed['game_id'], player_id=seed['sibling_id'],
+                  event_type=event_types[i % len(event_types)], timestamp_seconds=i,
+                  field_position_x=x, field_position_y=y)
+        for i, (x, y) in enumerate(positions)
+    ])
+    db.commit()
+
+    service = HeatMapService(db)
+    monkeypatch.setattr(HeatMapService, '_sql_has_floor', lambda self: sql_floor)
+    points = service.generate_combined_heatmap(seed['game_id'])
+    cells = service.generate_combined_heatmap(seed['game_id'], grid_only=True)
+
+    assert len(points.points) == len(positions) + 1
+    assert cells.points == []
+    np.testing.assert_allclose(cells.grid, points.grid, rtol=1e-5, atol=1e-5)
+    assert cells.max_intensity == pytest.approx(points.max_intensity, rel=1e-5)
+
+
+# =============================================================================
+# Caching and ETags
+# =============================================================================
+
+@pytest.mark.parametrize('field, value', [
+    ('field_position_x', 0.75),
+    ('field_position_y', 0.1),
+    ('timestamp_seconds', 300),
+])
+def test_corrected_event_changes_player_heatmap_etag(client, db, seed, redis, field, value):
+    from src.models import GameEvent
+
+    login(client)
+    url = f"/api/heatmap/player/{seed['kid_id']}"
+    first = client.get(url)
+    assert first.status_code == 200
+
+    event = db.get(GameEvent, seed['event_id'])
+    setattr(event, field, value)
+    db.commit()
+
+    second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
+def test_corrected_event_type_changes_game_heatmap_etag(client, db, seed):
+    from src.models import EventType, GameEvent
+
+    login(client)
+    url = f"/api/heatmap/game/{seed['game_id']}"
+    first = client.get(url)
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    db.get(GameEvent, seed['event_id']).event_type = EventType.SHOT
+    db.commit()
+
+    second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+
+
+def test_swapped_positions_change_events_version(db, seed):
+    from src.models import EventType, GameEvent
+    from src.services.heatmap import HeatMapService
+
+    other = GameEvent(game_id=seed['game_id'], player_id=seed['kid_id'],
+                      event_type=EventType.GOAL, timestamp_seconds=200,
+                      field_position_x=0.9, field_position_y=0.5)
+    db.add(other)
+    db.commit()
+
+    service = HeatMapService(db)
+    before = service.events_version(seed['kid_id'])
+
+    event = db.get(GameEvent, seed['event_id'])
+    event.field_position_x, other.field_position_x = other.field_position_x, event.field_position_x
+    db.commit()
+
+    assert service.events_version(seed['kid_id']) != before
+
+
+def test_events_version_sums_use_bigint_products(db, seed, monkeypatch):
+    from sqlalchemy import BigInteger, Float
+    from sqlalchemy.dialects import postgresql
+
+    queries = []
+    query = db.query
+
+    def recording_query(*columns):
+        queries.append(query(*columns))
+        return queries[-1]
+
+    monkeypatch.setattr(db, 'query', recording_query)
+    HeatMapService(db).events_version(player_id=seed['kid_id'], game_id=seed['game_id'])
+
+    [version_query] = queries
+    checksums = version_query.statement.selected_columns[2:]
+    assert len(checksums) == 5
+    for checksum in checksums:
+        # id x player_id and id x type code must not be int4 x int4 products
+        [product] = checksum.clauses
+        assert isinstance(product.left.type, BigInteger)
+        assert isinstance(product.type, (BigInteger, Float))
+
+    sql = str(version_query.statement.compile(dialect=postgresql.dialect()))
+    assert sql.count('CAST(game_events.id AS BIGINT) *') == 5
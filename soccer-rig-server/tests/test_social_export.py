@@ -0,0 +1,211 @@
+"""Tests for the social export routes: job queue, polling and output reuse."""
+
+import os
+import time
+
+import pytest
+
+from conftest import login
+from src.services.social_export import SocialMediaExporter
+
+
+@pytest.fixture
+def exports(monkeypatch):
+    """Replace the ffmpeg export with one that writes a small file; records calls."""
+    calls = []
+
+    def fake_export(self, output_path, **kwargs):
+        calls.append(dict(kwargs, output_path=output_path))
+        with open(output_path, 'wb') as f:
+            f.write(b'mp4')
+        return {'success': True, 'output_path': output_path, 'file_size_mb': 0.0}
+
+    monkeypatch.setattr(SocialMediaExporter, 'export_clip', fake_export)
+    monkeypatch.setattr(SocialMediaExporter, 'export_highlight_reel', fake_export)
+    return calls
+
+
+def _wait_for_job(client, job_id):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/social/job/{job_id}').get_json()
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def _output_files(app):
+    return sorted(os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'social')))
+
+
+# =============================================================================
+# Background jobs
+# =============================================================================
+
+def test_export_is_queued_and_poll_returns_result(app, client, seed, redis, exports):
+    login(client)
+    response = client.post('/api/social/export', json={'clip_id': seed['clip_id']})
+    assert response.status_code == 202
+
+    job = _wait_for_job(client, response.get_json()['job_id'])
+    assert job['status'] == 'completed'
+    assert job['success'] is True
+    assert job['download_url'] == f"/api/social/download/{_output_files(app)[0]}"
+    assert 'user_id' not in job
+
+
+def test_job_poll_by_another_user_is_rejected(app, seed, redis, exports):
+    owner, stranger = app.test_client(), app.test_client()
+    login(owner)
+    login(stranger, 'other@example.com', 'secret2')
+
+    job_id = owner.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()['job_id']
+    _wait_for_job(owner, job_id)
+
+    response = stranger.get(f'/api/social/job/{job_id}')
+    assert response.status_code == 404
+    assert 'download_url' not in response.get_json()
+
+
+def test_failed_export_leaves_no_output(app, client, seed, redis, monkeypatch):
+    def failing_export(self, output_path, **kwargs):
+        with open(output_path, 'wb') as f:
+            f.write(b'partial')
+        return {'success': False, 'error': 'ffmpeg exited 1'}
+
+    monkeypatch.setattr(SocialMediaExporter, 'export_clip', failing_export)
+    login(client)
+    job_id = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()['job_id']
+
+    job = _wait_for_job(client, job_id)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'ffmpeg exited 1'
+    assert _output_files(app) == []
+
+
+def test_lost_job_is_reported_timed_out(app, client, seed, redis, exports, monkeypatch):
+    from types import SimpleNamespace
+    from src.services import social_export
+
+    # The worker that would run the job never does (restart, pool shut down)
+    monkeypatch.setattr(social_export._export_pool, 'submit', lambda fn: None)
+    login(client)
+    response = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+
+    # Base wait plus wall time for the 12 s clip
+    timeout = response['timeout_seconds']
+    assert timeout == social_export.SOCIAL_JOB_TIMEOUT_BASE + 12 * social_export.SOCIAL_JOB_TIMEOUT_PER_SECOND
+    assert client.get(f"/api/social/job/{response['job_id']}").get_json() == {'status': 'queued'}
+
+    now = social_export.time.time()
+    monkeypatch.setattr(social_export, 'time', SimpleNamespace(time=lambda: now + timeout + 1))
+    job = client.get(f"/api/social/job/{response['job_id']}").get_json()
+    assert job == {'status': 'failed', 'success': False, 'error': 'timed out'}
+    assert exports == []
+
+
+def test_export_without_redis_runs_synchronously(app, client, seed, exports):
+    login(client)
+    response = client.post('/api/social/export', json={'clip_id': seed['clip_id']})
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['success'] is True
+    assert result['download_url'] == f"/api/social/download/{_output_files(app)[0]}"
+    assert 'job_id' not in result
+
+
+# =============================================================================
+# Output reuse
+# =============================================================================
+
+def test_identical_export_reuses_finished_file(app, client, seed, exports):
+    login(client)
+    first = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+    second = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+
+    assert len(exports) == 1
+    assert second['status'] == 'completed'
+    assert second['download_url'] == first['download_url']
+    assert len(_output_files(app)) == 1
+
+
+def _change_clip_bounds(db, seed):
+    from src.models import Clip
+    db.get(Clip, seed['clip_id']).start_time = 130
+    db.commit()
+
+
+def _change_overlay_text(db, seed):
+    from src.models import Player
+    db.get(Player, seed['kid_id']).first_name = 'Kiddo'
+    db.commit()
+
+
+def _change_source_video(db, seed):
+    from src.models import Game
+    path = db.get(Game, seed['game_id']).panorama_url
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize('change', [
+    _change_clip_bounds, _change_overlay_text, _change_source_video,
+], ids=['clip-bounds', 'overlay-text', 'source-video'])
+def test_changed_export_inputs_produce_new_file(app, client, db, seed, exports, change):
+    login(client)
+    first = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+    change(db, seed)
+    second = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+
+    assert len(exports) == 2
+    assert second['download_url'] != first['download_url']
+    assert len(_output_files(app)) == 2
+
+
+@pytest.mark.parametrize('options', [
+    {'max_duration': 5}, {'show_score': True},
+], ids=['duration', 'score-overlay'])
+def test_changed_export_options_produce_new_file(app, client, seed, exports, options):
+    login(client)
+    client.post('/api/social/export', json={'clip_id': seed['clip_id']})
+    client.post('/api/social/export', json=dict(options, clip_id=seed['clip_id']))
+
+    assert len(exports) == 2
+    assert len(_output_files(app)) == 2
+
+
+@pytest.mark.parametrize('config', [
+    {'output_resolution': (1080, 1080)},
+    {'fragmented': False},
+    {'show_player_name': False},
+    {'target_file_mb': 50},
+], ids=['resolution', 'container', 'overlay', 'size-target'])
+def test_export_key_changes_with_output_format(tmp_path, config):
+    from src.services.social_export import SocialClipConfig
+
+    source = tmp_path / 'panorama.mp4'
+    source.write_bytes(b'video')
+    args = {'source_video': str(source), 'start_time': 10, 'duration': 15}
+
+    default = SocialMediaExporter().export_key(**args)
+    assert SocialMediaExporter().export_key(**args) == default
+    assert SocialMediaExporter(SocialClipConfig(**config)).export_key(**args) != default
+
+
+def test_failed_export_is_retried_not_reused(app, client, seed, exports, monkeypatch):
+    def failing_export(self, output_path, **kwargs):
+        with open(output_path, 'wb') as f:
+            f.write(b'partial')
+        return {'success': False, 'error': 'ffmpeg exited 1'}
+
+    login(client)
+    with monkeypatch.context() as m:
+        m.setattr(SocialMediaExporter, 'export_clip', failing_export)
+        assert client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()['success'] is False
+    assert _output_files(app) == []
+
+    result = client.post('/api/social/export', json={'clip_id': seed['clip_id']}).get_json()
+    assert result['success'] is True
+    assert len(exports) == 1
@@ -0,0 +1,90 @@
+"""Tests for the TeamSnap integration routes."""
+
+from conftest import login
+
+
+def _player_names(client):
+    return [p['name'] for p in client.get('/api/user/players').get_json()['players']]
+
+
+def _add_player(db, seed, first_name):
+    from src.models import Player, Team
+
+    player = Player(first_name=first_name, last_name='New', birth_year=2013)
+    player.teams.append(db.get(Team, seed['team_id']))
+    db.add(player)
+    db.commit()
+    return player.id
+
+
+# =============================================================================
+# /api/user/players cache invalidation
+# =============================================================================
+
+def test_link_player_invalidates_cached_players(client, db, seed, redis):
+    login(client)
+    assert _player_names(client) == ['Kid One', 'Kid Two']
+
+    player_id = _add_player(db, seed, 'Linked')
+    response = client.post('/api/data/link-player', json={'player_id': player_id})
+    assert response.get_json()['success'] is True
+
+    assert _player_names(client) == ['Kid One', 'Kid Two', 'Linked New']
+
+
+def test_sync_invalidates_cached_players(client, db, seed, redis, monkeypatch):
+    from src.integrations.teamsnap import TeamSnapSyncService
+    from src.models import User, parent_player
+
+    user = db.get(User, seed['parent_id'])
+    user.teamsnap_client_id, user.teamsnap_client_secret = 'client-id', 'client-secret'
+    db.commit()
+
+    login(client)
+    assert _player_names(client) == ['Kid One', 'Kid Two']
+
+    def fake_sync(self, user_id):
+        player_id = _add_player(db, seed, 'Synced')
+        db.execute(parent_player.insert().values(parent_id=user_id, player_id=player_id))
+        db.commit()
+        return {'teams_created': 0}
+
+    monkeypatch.setattr(TeamSnapSyncService, 'sync_user_teams', fake_sync)
+    assert client.post('/api/teamsnap/sync').status_code == 200
+
+    assert _player_names(client) == ['Kid One', 'Kid Two', 'Synced New']
+
+
+def test_sync_invalidates_coaches_and_parents_of_synced_teams(app, db, seed, redis, monkeypatch):
+    from src.integrations.teamsnap import TeamSnapSyncService
+    from src.models import Player, Team, User, UserRole
+
+    coach = User(email='coach@example.com', first_name='Cal', last_name='Coach', role=UserRole.COACH)
+    coach.set_password('secret3')
+    coach.coached_teams.append(db.get(Team, seed['team_id']))
+    syncer = db.get(User, seed['other_id'])
+    syncer.teamsnap_client_id, syncer.teamsnap_client_secret = 'client-id', 'client-secret'
+    db.add(coach)
+    db.commit()
+
+    coach_client, parent_client, syncer_client = app.test_client(), app.test_client(), app.test_client()
+    login(coach_client, 'coach@example.com', 'secret3')
+    login(parent_client)
+    login(syncer_client, 'other@example.com', 'secret2')
+    assert _player_names(coach_client) == ['Kid One', 'Kid Two']
+    assert _player_names(parent_client) == ['Kid One', 'Kid Two']
+
+    def fake_sync(self, user_id):
+        # The synced roster gains a player and Kid One joins a second team
+        _add_player(db, seed, 'Synced')
+        kid = db.get(Player, seed['kid_id'])
+        kid.teams.append(Team(name='Red', season='Fall 2024'))
+        db.commit()
+        return {'teams_created': 1, 'teams': [{'team_id': seed['team_id'], 'created': False}]}
+
+    monkeypatch.setattr(TeamSnapSyncService, 'sync_user_teams', fake_sync)
+    assert syncer_client.post('/api/teamsnap/sync').status_code == 200
+
+    assert _player_names(coach_client) == ['Kid One', 'Kid Two', 'Synced New']
+    kid = parent_client.get('/api/user/players').get_json()['players'][0]
+    assert sorted(team['name'] for team in kid['teams']) == ['Blue', 'Red']
@@ -0,0 +1,50 @@
+/**
+ * Soccer Rig Server - Settings page
+ * Fills the cached settings shell from /api/user/settings
+ */
+
+(async () => {
+    const form = document.getElementById('settings-form');
+
+    if (new URLSearchParams(location.search).has('saved')) {
+        document.getElementById('saved-banner').hidden = false;
+    }
+
+    let settings;
+    try {
+        const response = await fetch('/api/user/settings', { credentials: 'same-origin' });
+        // Unauthenticated requests are redirected to the login page
+        if (!response.ok || response.redirected) {
+            location.href = '/login';
+            return;
+        }
+        settings = await response.json();
+    } catch (e) {
+        console.error('Failed to load settings:', e);
+        return;
+    }
+
+    form.querySelectorAll('[data-field]').forEach(el => {
+        const value = settings[el.dataset.field];
+        if (el.type === 'checkbox') {
+            el.checked = Boolean(value);
+        } else {
+            el.value = value ?? '';
+        }
+    });
+    document.querySelectorAll('[data-text]').forEach(el => {
+        el.textContent = settings[el.dataset.text] ?? '';
+    });
+
+    // The stored secret is never sent to the browser; a blank field keeps it
+    if (settings.teamsnap_has_secret) {
+        document.getElementById('teamsnap-client-secret').placeholder = 'Saved - leave blank to keep';
+    }
+    document.getElementById('teamsnap-connected').hidden = !settings.teamsnap_connected;
+    document.getElementById('teamsnap-setup').hidden = settings.teamsnap_connected;
+    document.getElementById('teamsnap-connect').hidden = settings.teamsnap_connected ||
+        !(settings.teamsnap_client_id && settings.teamsnap_has_secret);
+
+    // Only allow saving once the form holds the user's current values
+    form.querySelector('button[type="submit"]').disabled = false;
+})();